@@ -0,0 +1 @@
+"""Benchmarks of the AccuWeather integration against a local fake of the API."""
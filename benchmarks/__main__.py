@@ -0,0 +1,49 @@
+"""Run the benchmarks and compare them with the previous run.
+
+    python -m benchmarks [-k NAME] [--baseline PATH] [--threshold 0.2] [--no-save]
+
+Exits with status 1 when a benchmark got slower than the baseline by more than the
+threshold.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from .harness import (
+    async_run,
+    compare,
+    load_benchmarks,
+    load_results,
+    report,
+    save_results,
+)
+
+
+def main() -> int:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description="AccuWeather integration benchmarks")
+    parser.add_argument("-k", dest="names", action="append", help="name filter")
+    parser.add_argument("--baseline", type=Path, default=Path(".benchmarks.json"))
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--quick", action="store_true", help="run a tenth of the calls per round"
+    )
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    load_benchmarks()
+    results = asyncio.run(async_run(args.names, args.rounds, 0.1 if args.quick else 1))
+    baseline = load_results(args.baseline)
+    print(report(results, baseline))
+    regressions = compare(results, baseline, args.threshold)
+    for name, (old, new) in regressions.items():
+        print(f"REGRESSION {name}: {old:.2f} -> {new:.2f} us/call")
+    if not args.no_save:
+        save_results(args.baseline, {**baseline, **results})
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
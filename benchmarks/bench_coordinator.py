@@ -0,0 +1,23 @@
+"""Benchmarks of the data update."""
+from homeassistant.util.dt import utcnow
+
+from .harness import benchmark
+
+
+@benchmark(number=50)
+def update_data_current(env):
+    """Update of the current conditions, the forecasts are still fresh."""
+    return env.coordinator._async_update_data
+
+
+@benchmark(number=20)
+def update_data_all_stages(env):
+    """Update of the current conditions and both forecasts."""
+    coordinator = env.coordinator
+
+    async def update():
+        coordinator._forecast_next_update = utcnow()
+        coordinator._hourly_next_update = utcnow()
+        await coordinator._async_update_data()
+
+    return update
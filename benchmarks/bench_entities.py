@@ -0,0 +1,36 @@
+"""Benchmarks of the entity setup and render paths."""
+from custom_components.accuweather import sensor
+
+from .harness import benchmark
+
+
+async def _async_setup_sensors(env) -> list:
+    """Return the sensors of the config entry."""
+    entities = []
+    await sensor.async_setup_entry(
+        env.hass, env.config_entry, lambda new, update=False: entities.extend(new)
+    )
+    return entities
+
+
+@benchmark(number=100)
+def setup_forecast_sensor_matrix(env):
+    """Creation of all sensors, with all forecast days, and their first state."""
+
+    async def setup():
+        for entity in await _async_setup_sensors(env):
+            entity._state_to_write()
+
+    return setup
+
+
+@benchmark(number=1000)
+async def sensor_state_all_kinds(env):
+    """State of every sensor kind."""
+    entities = await _async_setup_sensors(env)
+
+    def render():
+        for entity in entities:
+            entity.state
+
+    return render
@@ -0,0 +1,102 @@
+"""Benchmarks of the weather entity."""
+from homeassistant.const import STATE_UNKNOWN
+
+from custom_components.accuweather.const import CONDITION_CLASSES
+from custom_components.accuweather.weather import AccuWeatherEntity
+
+from .harness import benchmark
+
+ENTITIES = 100
+# The icons of all conditions and two unknown icons.
+ICONS = list(range(1, 46))
+
+
+def _scan_condition(icon) -> str:
+    """Return the condition of the icon by the scan of all conditions."""
+    try:
+        return [k for k, v in CONDITION_CLASSES.items() if icon in v][0]
+    except IndexError:
+        return STATE_UNKNOWN
+
+
+@benchmark(number=20)
+def condition_lookup_many_entities(env):
+    """Condition of many weather entities for every icon, by the icon map."""
+    entities = [
+        AccuWeatherEntity(f"Home {i}", env.coordinator) for i in range(ENTITIES)
+    ]
+    current = env.coordinator.data.current
+
+    def render():
+        for icon in ICONS:
+            current.weather_icon = icon
+            for entity in entities:
+                entity.condition
+
+    return render
+
+
+@benchmark(number=20)
+def condition_scan_many_entities(env):
+    """The same conditions by the scan of all conditions, for comparison."""
+    entities = [
+        AccuWeatherEntity(f"Home {i}", env.coordinator) for i in range(ENTITIES)
+    ]
+    current = env.coordinator.data.current
+
+    def render():
+        for icon in ICONS:
+            current.weather_icon = icon
+            for entity in entities:
+                _scan_condition(entity.coordinator.data.current.weather_icon)
+
+    return render
+
+
+def _state_write(env, hourly: bool, memoized: bool):
+    """Return the state write of a weather entity, with the forecast memo or not."""
+    entity = AccuWeatherEntity("Home", env.coordinator, hourly)
+    entity.hass = env.hass
+
+    def write():
+        if not memoized:
+            entity._forecast_source = None
+        return entity._state_to_write()
+
+    return write
+
+
+@benchmark(number=10000)
+def weather_forecast_build(env):
+    """Conversion of the daily forecast for the weather entity."""
+    entity = AccuWeatherEntity("Home", env.coordinator)
+
+    def build():
+        entity._forecast_source = None
+        return entity.forecast
+
+    return build
+
+
+@benchmark(number=10000)
+def weather_state_write_memoized(env):
+    """State write of the weather entity, the forecast is converted once."""
+    return _state_write(env, hourly=False, memoized=True)
+
+
+@benchmark(number=10000)
+def weather_state_write_rebuilt(env):
+    """State write of the weather entity converting the forecast every time."""
+    return _state_write(env, hourly=False, memoized=False)
+
+
+@benchmark(number=10000)
+def weather_hourly_state_write_memoized(env):
+    """State write of the hourly weather entity, the forecast is converted once."""
+    return _state_write(env, hourly=True, memoized=True)
+
+
+@benchmark(number=10000)
+def weather_hourly_state_write_rebuilt(env):
+    """State write of the hourly weather entity converting the forecast every time."""
+    return _state_write(env, hourly=True, memoized=False)
@@ -0,0 +1,127 @@
+"""Local stand-in of the AccuWeather API serving recorded responses.
+
+The latency, the errors and the RateLimit-Remaining header of each endpoint can be
+configured, the requests are counted per endpoint. It runs in the test event loop or
+as a script:
+
+    python -m benchmarks.fake_api --port 8081 --latency 0.2
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from typing import Optional
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).parent / "fixtures"
+REQUESTS_EXCEEDED = "The allowed number of requests has been exceeded."
+VALID_API_KEY = "0123456789abcdef0123456789abcdef"
+
+# Endpoint: route of the API
+ROUTES = {
+    "location": "/locations/v1/cities/geoposition/search",
+    "current_conditions": "/currentconditions/v1/{location_key}",
+    "historical_conditions": "/currentconditions/v1/{location_key}/historical/24",
+    "forecast": "/forecasts/v1/daily/5day/{location_key}",
+    "hourly_forecast": "/forecasts/v1/hourly/{hours}hour/{location_key}",
+    "alerts": "/alerts/v1/{location_key}",
+    "minutecast": "/forecasts/v1/minute",
+}
+
+
+def load_fixture(endpoint: str):
+    """Return the recorded response of the endpoint."""
+    return json.loads((FIXTURES / f"{endpoint}.json").read_text())
+
+
+class FakeAccuWeatherAPI:
+    """Serve recorded AccuWeather responses with configurable behaviour."""
+
+    def __init__(
+        self,
+        latency: float = 0,
+        requests_remaining: int = 50,
+        api_keys: Optional[set] = None,
+    ):
+        """Initialize."""
+        # Seconds each response is delayed, per endpoint with the endpoint as key.
+        self.latency = latency
+        self.endpoint_latency = {}
+        self.requests_remaining = requests_remaining
+        # Endpoint: HTTP status returned instead of the data.
+        self.errors = {}
+        self.api_keys = api_keys if api_keys is not None else {VALID_API_KEY}
+        self.requests = {endpoint: 0 for endpoint in ROUTES}
+        self.responses = {endpoint: load_fixture(endpoint) for endpoint in ROUTES}
+        self.url = None
+        self._runner = None
+
+    @property
+    def request_count(self) -> int:
+        """Return the number of requests made to all endpoints."""
+        return sum(self.requests.values())
+
+    def create_app(self) -> web.Application:
+        """Return the web application of the fake API."""
+        app = web.Application()
+        for endpoint, route in ROUTES.items():
+            app.router.add_get(route, self._handler(endpoint))
+        return app
+
+    def _handler(self, endpoint: str):
+        """Return the request handler of the endpoint."""
+
+        async def handle(request: web.Request) -> web.Response:
+            """Answer like the AccuWeather API does."""
+            self.requests[endpoint] += 1
+            await asyncio.sleep(self.endpoint_latency.get(endpoint, self.latency))
+            if request.query.get("apikey") not in self.api_keys:
+                return web.json_response(
+                    {"Code": "Unauthorized", "Message": "Api Authorization failed"},
+                    status=401,
+                )
+            if self.requests_remaining <= 0:
+                return web.json_response({"Message": REQUESTS_EXCEEDED}, status=503)
+            if endpoint in self.errors:
+                return web.json_response(
+                    {"Message": "Error"}, status=self.errors[endpoint]
+                )
+            self.requests_remaining -= 1
+            return web.json_response(
+                self.responses[endpoint],
+                headers={"RateLimit-Remaining": str(self.requests_remaining)},
+            )
+
+        return handle
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, return the base URL of the fake API."""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{port}/"
+        return self.url
+
+    async def async_stop(self):
+        """Stop serving."""
+        await self._runner.cleanup()
+
+
+def main():
+    """Run the fake API."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--requests-remaining", type=int, default=50)
+    args = parser.parse_args()
+    api = FakeAccuWeatherAPI(args.latency, args.requests_remaining)
+    print(f"API key: {VALID_API_KEY}")
+    web.run_app(api.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
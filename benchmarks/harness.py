@@ -0,0 +1,193 @@
+"""Benchmark harness of the AccuWeather integration.
+
+Each benchmark returns the callable to time, its setup is not timed. The results of a
+run are compared with the results of the previous run to track regressions.
+"""
+import asyncio
+import inspect
+import json
+import pkgutil
+import tempfile
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Optional
+
+from aiohttp import ClientSession
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_NAME,
+    EVENT_HOMEASSISTANT_CLOSE,
+)
+from homeassistant.core import HomeAssistant
+
+from custom_components.accuweather import AccuWeatherDataUpdateCoordinator, budget
+from custom_components.accuweather.const import (
+    CONF_FORECAST,
+    CONF_HOURLY_FORECAST,
+    COORDINATOR,
+    DOMAIN,
+)
+
+from .fake_api import VALID_API_KEY, FakeAccuWeatherAPI, load_fixture
+
+# Name: (function returning the callable to time, calls per round)
+BENCHMARKS = {}
+LOCATION_KEY = load_fixture("location")["Key"]
+
+
+def benchmark(number: int = 1000):
+    """Register a benchmark timing number calls per round."""
+
+    def decorator(func: Callable):
+        BENCHMARKS[func.__name__] = (func, number)
+        return func
+
+    return decorator
+
+
+def load_benchmarks():
+    """Import the bench_* modules registering the benchmarks."""
+    for module in pkgutil.iter_modules([str(Path(__file__).parent)]):
+        if module.name.startswith("bench_"):
+            import_module(f"{__package__}.{module.name}")
+
+
+class Environment:
+    """Home Assistant with a config entry of a location served by the fake API."""
+
+    def __init__(self, hass, api, session, config_entry, coordinator):
+        """Initialize."""
+        self.hass = hass
+        self.api = api
+        self.session = session
+        self.config_entry = config_entry
+        self.coordinator = coordinator
+
+
+async def async_create_environment(config_dir: str, **options) -> Environment:
+    """Set up the fake API and a coordinator with fresh data."""
+    # The fetches of locations sharing an API key are spaced, not what is measured.
+    budget.FETCH_SPACING = 0
+    hass = HomeAssistant(asyncio.get_running_loop())
+    hass.config.config_dir = config_dir
+    hass.data[DOMAIN] = {}
+    api = FakeAccuWeatherAPI(requests_remaining=10**9)
+    await api.async_start()
+    session = ClientSession()
+    options = {CONF_FORECAST: True, CONF_HOURLY_FORECAST: 12, **options}
+    config_entry = ConfigEntry(
+        version=1,
+        domain=DOMAIN,
+        title="Home",
+        data={
+            CONF_NAME: "Home",
+            CONF_API_KEY: VALID_API_KEY,
+            CONF_LATITUDE: 52.23,
+            CONF_LONGITUDE: 21.01,
+        },
+        source="user",
+        connection_class="cloud_poll",
+        system_options={},
+        options=options,
+        unique_id=LOCATION_KEY,
+    )
+    coordinator = AccuWeatherDataUpdateCoordinator(
+        hass,
+        session,
+        [VALID_API_KEY],
+        LOCATION_KEY,
+        options[CONF_FORECAST],
+        hourly_forecast=options[CONF_HOURLY_FORECAST],
+        base_url=api.url,
+    )
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        raise RuntimeError("The fake API did not serve the data")
+    hass.data[DOMAIN][config_entry.entry_id] = {COORDINATOR: coordinator}
+    return Environment(hass, api, session, config_entry, coordinator)
+
+
+async def async_close_environment(env: Environment):
+    """Stop the fake API and the pending tasks."""
+    env.hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await env.hass.async_block_till_done()
+    await env.session.close()
+    await env.api.async_stop()
+
+
+async def async_time(func: Callable, number: int, rounds: int) -> float:
+    """Return the best time of a call in seconds over the rounds."""
+    is_async = inspect.iscoroutinefunction(func)
+    best = None
+    for _ in range(rounds):
+        start = perf_counter()
+        if is_async:
+            for _ in range(number):
+                await func()
+        else:
+            for _ in range(number):
+                func()
+        elapsed = (perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+async def async_run(
+    names: Optional[list] = None, rounds: int = 5, number_scale: float = 1
+) -> dict:
+    """Run the benchmarks, return the time of a call in microseconds by name."""
+    results = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        for name, (func, number) in BENCHMARKS.items():
+            if names and not any(part in name for part in names):
+                continue
+            # Every benchmark gets a fresh environment.
+            env = await async_create_environment(config_dir)
+            try:
+                timed = (
+                    await func(env) if inspect.iscoroutinefunction(func) else func(env)
+                )
+                seconds = await async_time(
+                    timed, max(int(number * number_scale), 1), rounds
+                )
+            finally:
+                await async_close_environment(env)
+            results[name] = seconds * 1e6
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    """Return the benchmarks slower than the baseline by more than the threshold."""
+    return {
+        name: (baseline[name], value)
+        for name, value in results.items()
+        if name in baseline and value > baseline[name] * (1 + threshold)
+    }
+
+
+def report(results: dict, baseline: dict) -> str:
+    """Return the results as a table with the change against the baseline."""
+    lines = [f"{'benchmark':<40} {'us/call':>12} {'change':>8}"]
+    for name, value in results.items():
+        change = (
+            f"{(value / baseline[name] - 1) * 100:+.1f}%" if name in baseline else "new"
+        )
+        lines.append(f"{name:<40} {value:>12.2f} {change:>8}")
+    return "\n".join(lines)
+
+
+def load_results(path: Path) -> dict:
+    """Return the results of the previous run."""
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def save_results(path: Path, results: dict):
+    """Store the results as the baseline of the next run."""
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
@@ -1,59 +1,199 @@
 """The AccuWeather component."""
 import asyncio
 import logging
+import random
 from datetime import timedelta
+from functools import partial
+from time import monotonic
+from typing import Callable, Iterable, Optional
 
-from accuweather import AccuWeather, ApiError, InvalidApiKeyError, RequestsExceededError
-from aiohttp.client_exceptions import ClientConnectorError
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from accuweather import InvalidApiKeyError, RequestsExceededError
 from async_timeout import timeout
-from homeassistant.const import CONF_API_KEY
-from homeassistant.core import Config, HomeAssistant
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    EVENT_CORE_CONFIG_UPDATE,
+)
+from homeassistant.core import Config, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util.dt import utc_from_timestamp, utcnow
 
+from .api import UPDATE_ERRORS, AccuWeatherClient
+from .budget import get_budget, release_budget
+from .cache import AccuWeatherCache
 from .const import (
-    ATTR_FORECAST,
+    ALL_FIELDS,
+    ATTR_ATTRIBUTES,
+    ATTR_FIELD,
+    ATTR_LOCATION_KEY,
+    ATTR_LOCATIONS,
+    ATTR_UNIT_METRIC,
+    BACKFILL_GAP,
+    BACKFILL_INTERVAL,
+    BUDGETS,
+    CONF_ALERTS,
+    CONF_API_KEYS,
+    CONF_BASE_URL,
     CONF_FORECAST,
+    CONF_FORECAST_DAYS,
+    CONF_HOURLY_FORECAST,
+    CONF_MAX_DATA_AGE,
+    CONF_MINUTECAST,
+    CONF_PRIORITY,
     COORDINATOR,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_PRIORITY,
     DOMAIN,
+    ENDPOINT_ALERTS,
+    ENDPOINT_CURRENT_CONDITIONS,
+    ENDPOINT_FORECAST,
+    ENDPOINT_HISTORICAL_CONDITIONS,
+    ENDPOINT_HOURLY_FORECAST,
+    ENDPOINT_MINUTECAST,
+    FORECAST_SENSOR_TYPES,
+    FORECAST_UPDATE_INTERVAL,
+    HOURLY_FORECAST_UPDATE_INTERVAL,
+    MAX_FORECAST_DAYS,
+    NOWCAST_BURST_UPDATES_PER_DAY,
+    NOWCAST_SLOW_INTERVAL,
+    OPTIONS,
+    RETRY_INTERVAL,
+    SERVICE_IMPORT_LOCATIONS,
+    TREND_SAMPLES,
     UNDO_UPDATE_LISTENER,
+    WEATHER_FORECAST_FIELDS,
 )
+from .derived import LocalConditions, fill_derived
+from .entity import async_get_disabled_unique_ids, sensor_unique_id
+from .locations import async_get_location_cache
+from .metrics import AccuWeatherMetrics
+from .model import AccuWeatherData, CurrentConditions, ForecastDay, HourlyForecast
+from .nowcast import AccuWeatherNowcastCoordinator
+from .scheduler import UpdateScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor", "weather"]
 
+IMPORT_LOCATIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_LOCATIONS): [
+            vol.Schema(
+                {
+                    vol.Required(CONF_LATITUDE): cv.latitude,
+                    vol.Required(CONF_LONGITUDE): cv.longitude,
+                    vol.Optional(ATTR_LOCATION_KEY): cv.string,
+                }
+            )
+        ],
+        vol.Optional(CONF_API_KEY): cv.string,
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: Config) -> bool:
     """Set up configured AccuWeather."""
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_import_locations(call: ServiceCall):
+        """Import location keys of geopositions into the location cache."""
+        locations = await async_get_location_cache(hass)
+        await locations.async_import(
+            call.data[ATTR_LOCATIONS],
+            api_key=call.data.get(CONF_API_KEY),
+            session=async_get_clientsession(hass),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_LOCATIONS,
+        async_import_locations,
+        schema=IMPORT_LOCATIONS_SCHEMA,
+    )
     return True
 
 
 async def async_setup_entry(hass, config_entry) -> bool:
     """Set up AccuWeather as config entry."""
-    api_key = config_entry.data[CONF_API_KEY]
+    api_keys = _api_keys(config_entry)
     location_key = config_entry.unique_id
     forecast = config_entry.options.get(CONF_FORECAST, False)
+    forecast_days = config_entry.options.get(CONF_FORECAST_DAYS, MAX_FORECAST_DAYS)
+    hourly_forecast = config_entry.options.get(CONF_HOURLY_FORECAST, 0)
+    max_data_age = config_entry.options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE)
+    priority = config_entry.options.get(CONF_PRIORITY, DEFAULT_PRIORITY)
+    base_url = config_entry.options.get(CONF_BASE_URL)
+    nowcast_endpoints = [
+        endpoint
+        for endpoint, option in (
+            (ENDPOINT_ALERTS, CONF_ALERTS),
+            (ENDPOINT_MINUTECAST, CONF_MINUTECAST),
+        )
+        if config_entry.options.get(option, False)
+    ]
 
     _LOGGER.debug("Using location_key: %s, get forecast: %s", location_key, forecast)
 
     websession = async_get_clientsession(hass)
 
+    # The location key of the configured geoposition is known, cache it for free.
+    locations = await async_get_location_cache(hass)
+    locations.set(
+        config_entry.data[CONF_LATITUDE],
+        config_entry.data[CONF_LONGITUDE],
+        location_key,
+    )
+
+    forecast_fields = _forecast_fields(
+        location_key,
+        forecast_days,
+        await async_get_disabled_unique_ids(hass, config_entry),
+    )
+
     coordinator = AccuWeatherDataUpdateCoordinator(
-        hass, websession, api_key, location_key, forecast
+        hass,
+        websession,
+        api_keys,
+        location_key,
+        forecast,
+        priority,
+        forecast_days=forecast_days,
+        forecast_fields=forecast_fields,
+        hourly_forecast=hourly_forecast,
+        max_data_age=timedelta(minutes=max_data_age),
+        nowcast_endpoints=nowcast_endpoints,
+        base_url=base_url,
     )
+    await coordinator.cache.async_load()
     await coordinator.async_refresh()
 
     if not coordinator.last_update_success:
+        coordinator.release_budget()
         raise ConfigEntryNotReady
 
+    if nowcast_endpoints:
+        # The nowcast sensors are empty until it is restored from the cache or
+        # fetched, the setup doesn't wait for it.
+        coordinator.nowcast = AccuWeatherNowcastCoordinator(
+            hass,
+            coordinator,
+            config_entry.data[CONF_LATITUDE],
+            config_entry.data[CONF_LONGITUDE],
+        )
+        hass.async_create_task(coordinator.nowcast.async_refresh())
+
     undo_listener = config_entry.add_update_listener(update_listener)
 
     hass.data[DOMAIN][config_entry.entry_id] = {
         COORDINATOR: coordinator,
         UNDO_UPDATE_LISTENER: undo_listener,
+        OPTIONS: dict(config_entry.options),
     }
 
     for component in PLATFORMS:
@@ -64,6 +204,29 @@ async def async_setup_entry(hass, config_entry) -> bool:
     return True
 
 
+def _api_keys(config_entry) -> list:
+    """Return the API keys of the config entry, the configured one first."""
+    return list(
+        dict.fromkeys(
+            [config_entry.data[CONF_API_KEY], *config_entry.data.get(CONF_API_KEYS, [])]
+        )
+    )
+
+
+def _forecast_fields(location_key, forecast_days, disabled) -> set:
+    """Return the forecast fields used by the weather entity and enabled sensors."""
+    fields = set(WEATHER_FORECAST_FIELDS)
+    for kind, description in FORECAST_SENSOR_TYPES.items():
+        if all(
+            sensor_unique_id(location_key, kind, day) in disabled
+            for day in range(forecast_days)
+        ):
+            continue
+        fields.add(description[ATTR_FIELD])
+        fields.update(description.get(ATTR_ATTRIBUTES, {}).values())
+    return fields
+
+
 async def async_unload_entry(hass, config_entry):
     """Unload a config entry."""
     unload_ok = all(
@@ -78,54 +241,621 @@ async def async_unload_entry(hass, config_entry):
     hass.data[DOMAIN][config_entry.entry_id][UNDO_UPDATE_LISTENER]()
 
     if unload_ok:
-        hass.data[DOMAIN].pop(config_entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(config_entry.entry_id)[COORDINATOR]
+        if coordinator.nowcast is not None:
+            coordinator.nowcast.async_stop()
+        coordinator.release_budget()
 
     return unload_ok
 
 
+async def async_remove_entry(hass, config_entry):
+    """Remove the cached data of a config entry."""
+    await AccuWeatherCache(hass, config_entry.unique_id).async_remove()
+
+
 async def update_listener(hass, config_entry):
     """Update listener."""
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    entry_data = hass.data[DOMAIN].get(config_entry.entry_id)
+    if entry_data is None:
+        # The entry is being reloaded.
+        return
+    if config_entry.options != entry_data[OPTIONS]:
+        # The options flow updates the data and the options of the entry, each update
+        # calls the listener. The entry is reloaded once.
+        entry_data[OPTIONS] = dict(config_entry.options)
+        await hass.config_entries.async_reload(config_entry.entry_id)
+        return
+
+    # Only the API keys changed, they are swapped in place keeping the data.
+    coordinator = entry_data[COORDINATOR]
+    api_keys = _api_keys(config_entry)
+    if api_keys != coordinator.api_keys:
+        coordinator.set_api_keys(api_keys)
+        if not coordinator.last_update_success:
+            await coordinator.async_refresh()
 
 
 class AccuWeatherDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching AccuWeather data API."""
 
-    def __init__(self, hass, session, api_key, location_key, forecast: bool):
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        hass,
+        session,
+        api_keys: list,
+        location_key,
+        forecast: bool,
+        priority: int = DEFAULT_PRIORITY,
+        forecast_days: int = MAX_FORECAST_DAYS,
+        forecast_fields: Optional[set] = None,
+        hourly_forecast: int = 0,
+        max_data_age: timedelta = timedelta(0),
+        nowcast_endpoints: Iterable[str] = (),
+        base_url: Optional[str] = None,
+    ):
         """Initialize."""
         self.location_key = location_key
         self.forecast = forecast
-        self.is_metric = hass.config.units.is_metric
-        self.accuweather = AccuWeather(api_key, session, location_key=self.location_key)
+        # The forecast is projected to the days and fields used by the entities.
+        self.forecast_days = forecast_days
+        self.forecast_fields = forecast_fields
+        # Hours of the hourly forecast, 0 if it is disabled.
+        self.hourly_forecast = hourly_forecast
+        # When an update fails the last good data stays available up to this age.
+        self.max_data_age = max_data_age
+        # The alerts and the MinuteCast are polled by their own coordinator.
+        self.nowcast_endpoints = list(nowcast_endpoints)
+        self.nowcast = None
+        self.data_updated = None
+        # Time of the last observation, also from before a restart, gaps after it
+        # are backfilled from the historical conditions.
+        self._last_observed = None
+        self._next_backfill = utcnow()
+        self._failures = 0
+        # The first API key is used until its quota runs out, then the next one.
+        self.api_keys = api_keys
+        self.api_key = api_keys[0]
+        self._invalid_api_keys = set()
+        self._reauth_requested = False
+        self.priority = priority
+        self.accuweather = AccuWeatherClient(
+            self.api_key, session, location_key=self.location_key, base_url=base_url
+        )
+        self.cache = AccuWeatherCache(hass, self.location_key)
+        self.metrics = AccuWeatherMetrics(self.accuweather)
+        self._restore_from_cache = True
+        self._current = None
+        self._forecast = []
+        self._hourly = None
+        # Trends and estimates computed locally between the API polls.
+        self.local = LocalConditions(TREND_SAMPLES)
+        self.stale_sections = set()
+        self._forecast_next_update = utcnow()
+        self._hourly_next_update = utcnow()
+        self._refresh_task = None
+        self._last_refresh = None
+        # Entities are notified only when the data paths they depend on change.
+        self._field_listeners = {}
+        self._field_listener_count = 0
+        self._remove_dispatcher = None
+        self._remove_config_listener = None
+        self._dispatched_data = None
+        self._dispatched_available = None
+        self._remove_expiry_listener = None
 
-        # Enabling the forecast download increases the number of requests per data
-        # update, we use 32 minutes for current condition only and 64 minutes for
-        # current condition and forecast as update interval to not exceed allowed number
-        # of requests. We have 50 requests allowed per day, so we use 45 and leave 5 as
-        # a reserve for restarting HA.
-        update_interval = (
-            timedelta(minutes=64) if self.forecast else timedelta(minutes=32)
+        # Current conditions and forecasts are fetched in separate stages. The daily
+        # forecast changes rarely so it is fetched only twice a day, the hourly
+        # forecast every few hours, the nowcast at least every few hours and in a
+        # limited number of bursts, a gap in
+        # the observations at most once a day, and the requests needed for them are
+        # reserved.
+        # The scheduler spreads the rest of the remaining requests over the rest of
+        # the UTC day for current conditions, so we poll more often when the quota
+        # allows and back off when it runs low. The budget of the API key weights the
+        # share of the quota of each location by its priority. Restarts within the
+        # update interval are served from the persistent cache.
+        self.scheduler = UpdateScheduler(
+            1,
+            reserved_per_day=(
+                (timedelta(days=1) // FORECAST_UPDATE_INTERVAL if self.forecast else 0)
+                + (
+                    timedelta(days=1) // HOURLY_FORECAST_UPDATE_INTERVAL
+                    if self.hourly_forecast
+                    else 0
+                )
+                + (
+                    timedelta(days=1) // NOWCAST_SLOW_INTERVAL
+                    + NOWCAST_BURST_UPDATES_PER_DAY
+                )
+                * len(self.nowcast_endpoints)
+                + timedelta(days=1) // BACKFILL_INTERVAL
+            ),
         )
+        # All locations using the same API key share its daily requests.
+        self.budget = get_budget(hass, self.api_key)
+        self.budget.register(self, self.priority)
+        update_interval = self.scheduler.default_interval
+        self.next_update = utcnow() + update_interval
         _LOGGER.debug("Data will be update every %s", update_interval)
 
         super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
 
-    async def _async_update_data(self):
-        """Update data via library."""
+    @callback
+    def async_add_field_listener(
+        self, paths: Iterable[str], update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen for changes of the data paths, ALL_FIELDS for every update."""
+        paths = list(paths)
+        if not self._field_listeners:
+            self._dispatched_data = self.data
+            self._dispatched_available = self.data_available
+            self._remove_dispatcher = self.async_add_listener(
+                self._async_dispatch_field_updates
+            )
+            self._remove_config_listener = self.hass.bus.async_listen(
+                EVENT_CORE_CONFIG_UPDATE, self._async_core_config_updated
+            )
+        for path in paths:
+            self._field_listeners.setdefault(path, []).append(update_callback)
+        self._field_listener_count += 1
+
+        @callback
+        def remove_listener():
+            """Remove the field listener."""
+            self._field_listener_count -= 1
+            for path in paths:
+                self._field_listeners[path].remove(update_callback)
+                if not self._field_listeners[path]:
+                    del self._field_listeners[path]
+            if not self._field_listeners:
+                self._remove_dispatcher()
+                self._remove_dispatcher = None
+                self._remove_config_listener()
+                self._remove_config_listener = None
+                self._cancel_data_expiry()
+
+        return remove_listener
+
+    @callback
+    def _async_core_config_updated(self, event):
+        """Render all entities again, the unit system may have changed."""
+        self._dispatched_data = None
+        self._async_dispatch_field_updates()
+
+    @callback
+    def _cancel_data_expiry(self):
+        """Cancel the scheduled end of the stale data."""
+        if self._remove_expiry_listener is not None:
+            self._remove_expiry_listener()
+            self._remove_expiry_listener = None
+
+    @callback
+    def _async_data_expired(self, now):
+        """Make the entities unavailable when the stale data gets too old."""
+        self._remove_expiry_listener = None
+        self._async_dispatch_field_updates()
+
+    @callback
+    def _async_dispatch_field_updates(self):
+        """Call the listeners of the data paths changed by the update."""
+        available = self.data_available
+        # Without a next update, e.g. until the quota is reset, the availability is
+        # re-evaluated when the stale data reaches the maximum age.
+        self._cancel_data_expiry()
+        if available and self.serving_stale:
+            self._remove_expiry_listener = async_track_point_in_utc_time(
+                self.hass,
+                self._async_data_expired,
+                self.data_updated + self.max_data_age,
+            )
+        if available != self._dispatched_available or self._dispatched_data is None:
+            # The availability of all entities changed.
+            paths = list(self._field_listeners)
+        elif self.data is self._dispatched_data:
+            paths = [ALL_FIELDS]
+        else:
+            paths = [ALL_FIELDS, *self.data.changed_paths(self._dispatched_data)]
+        self._dispatched_data = self.data
+        self._dispatched_available = available
+
+        callbacks = {}
+        for path in paths:
+            for update_callback in self._field_listeners.get(path, ()):
+                callbacks[update_callback] = None
+        self.metrics.notifications["notified"] += len(callbacks)
+        self.metrics.notifications["filtered"] += self._field_listener_count - len(
+            callbacks
+        )
+        for update_callback in callbacks:
+            update_callback()
+
+    def release_budget(self):
+        """Stop sharing the requests of the API key."""
+        release_budget(self.hass, self.api_key, self)
+
+    def set_api_keys(self, api_keys: list):
+        """Use new API keys, the data and the entities are kept."""
+        _LOGGER.debug("API keys of %s changed", self.location_key)
+        self.api_keys = api_keys
+        self._invalid_api_keys.clear()
+        self._reauth_requested = False
         try:
-            with timeout(10):
-                current = await self.accuweather.async_get_current_conditions()
-                forecast = (
-                    await self.accuweather.async_get_forecast(metric=self.is_metric)
-                    if self.forecast
-                    else {}
-                )
-        except (
-            ApiError,
-            ClientConnectorError,
-            InvalidApiKeyError,
-            RequestsExceededError,
-        ) as error:
-            raise UpdateFailed(error)
+            self._use_api_key(api_keys[0])
+        except InvalidApiKeyError:
+            self._invalid_api_keys.add(api_keys[0])
+            self._rotate_api_key()
+
+    def _use_api_key(self, api_key: str):
+        """Switch the client and the budget to the API key."""
+        if api_key == self.api_key:
+            # The budget keeps the remaining requests and the exhaustion of the key.
+            return
+        self.accuweather.set_api_key(api_key)
+        self.release_budget()
+        self.api_key = api_key
+        self.budget = get_budget(self.hass, api_key)
+        self.budget.register(self, self.priority)
+
+    def _rotate_api_key(self) -> bool:
+        """Switch to the next API key which may still have requests left.
+
+        When the quotas of all API keys are exhausted the location stays with its
+        API key and waits for the reset.
+        """
+        budgets = self.hass.data[DOMAIN][BUDGETS]
+        if self.api_key in self.api_keys:
+            index = self.api_keys.index(self.api_key)
+            api_keys = self.api_keys[index + 1 :] + self.api_keys[:index]
+        else:
+            api_keys = self.api_keys
+        for api_key in api_keys:
+            if api_key in self._invalid_api_keys:
+                continue
+            if api_key in budgets and budgets[api_key].exhausted:
+                continue
+            try:
+                self._use_api_key(api_key)
+            except InvalidApiKeyError:
+                self._invalid_api_keys.add(api_key)
+                continue
+            _LOGGER.debug("Switching %s to the next API key", self.location_key)
+            return True
+        return False
+
+    def _request_reauth(self):
+        """Ask the user for a new API key, once."""
+        if self._reauth_requested:
+            return
+        self._reauth_requested = True
+        self.hass.async_create_task(
+            self.hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": "reauth"},
+                data={ATTR_LOCATION_KEY: self.location_key},
+            )
+        )
+
+    @property
+    def is_metric(self) -> bool:
+        """Return True if the values are shown in metric units.
+
+        The data is kept in metric units and converted when the state is rendered,
+        changing the unit system doesn't need new data.
+        """
+        return self.hass.config.units.is_metric
+
+    @property
+    def data_age(self) -> Optional[timedelta]:
+        """Return the age of the current conditions."""
+        if self.data_updated is None:
+            return None
+        return utcnow() - self.data_updated
+
+    @property
+    def serving_stale(self) -> bool:
+        """Return True if the last update didn't bring fresh current conditions."""
+        return (
+            not self.last_update_success
+            or ENDPOINT_CURRENT_CONDITIONS in self.stale_sections
+        )
+
+    @property
+    def data_available(self) -> bool:
+        """Return True if the data is up to date or may still be served stale."""
+        if not self.serving_stale:
+            return True
+        data_age = self.data_age
+        return data_age is not None and data_age < self.max_data_age
+
+    def _retry_interval(self) -> timedelta:
+        """Return the time to the retry of a failed update, with backoff and jitter."""
+        scheduled = self.scheduler.next_interval(self.budget.requests_remaining)
+        backoff = min(scheduled, RETRY_INTERVAL * 2 ** (self._failures - 1))
+        # The jitter keeps the retries of locations failing at once apart.
+        return backoff * random.uniform(0.5, 1)
+
+    def _set_update_interval(self, update_interval: timedelta):
+        """Set the time to the next update."""
+        self.update_interval = update_interval
+        self.next_update = utcnow() + update_interval
+
+    def _restore_cached_data(self) -> bool:
+        """Restore the cached sections which are still fresh."""
+        forecast = self.cache.get(ENDPOINT_FORECAST)
+        if self.forecast and self._covers_forecast(forecast):
+            self._forecast = [
+                ForecastDay.from_dict(day) for day in forecast["data"]["days"]
+            ][: self.forecast_days]
+            self._forecast_next_update = utc_from_timestamp(forecast["valid_until"])
+            _LOGGER.debug("Using cached forecast until %s", self._forecast_next_update)
+
+        hourly = self.cache.get(ENDPOINT_HOURLY_FORECAST)
+        if (
+            self.hourly_forecast
+            and hourly is not None
+            and len(hourly["data"]["epoch_date"]) >= self.hourly_forecast
+        ):
+            self._hourly = HourlyForecast.from_dict(hourly["data"])
+            self._hourly_next_update = utc_from_timestamp(hourly["valid_until"])
+
+        # A restart doesn't spend another request on the backfill of the day.
+        backfill = self.cache.get(ENDPOINT_HISTORICAL_CONDITIONS)
+        if backfill is not None:
+            self._next_backfill = utc_from_timestamp(backfill["valid_until"])
+
+        self._last_observed = self.cache.fetched(ENDPOINT_CURRENT_CONDITIONS)
+        current = self.cache.get(ENDPOINT_CURRENT_CONDITIONS)
+        if current is None:
+            return False
+        self._current = CurrentConditions.from_dict(current["data"])
+        self.data_updated = utc_from_timestamp(current["fetched"])
+        self._set_update_interval(utc_from_timestamp(current["valid_until"]) - utcnow())
+        _LOGGER.debug("Using cached data, next update in %s", self.update_interval)
+        return True
+
+    def _covers_forecast(self, entry: Optional[dict]) -> bool:
+        """Return True if the cached forecast has all needed days and fields."""
+        if entry is None:
+            return False
+        fields = set(entry["data"]["fields"])
+        return len(entry["data"]["days"]) >= self.forecast_days and fields.issuperset(
+            self.forecast_fields or ForecastDay.FIELDS
+        )
+
+    async def _async_update_current_conditions(self):
+        """Fetch current conditions."""
+        start = monotonic()
+        with timeout(10):
+            data = await self.accuweather.async_get_current_conditions()
+        self.metrics.latency[ENDPOINT_CURRENT_CONDITIONS].observe(monotonic() - start)
+        current = CurrentConditions.from_api(data, ATTR_UNIT_METRIC)
+        fill_derived(current)
+        self.data_updated = utcnow()
+        self._last_observed = self.data_updated.timestamp()
         _LOGGER.debug("Requests remaining: %s", self.accuweather.requests_remaining)
-        return {**current, **{ATTR_FORECAST: forecast}}
+        self.budget.requests_remaining = self.accuweather.requests_remaining
+        self._set_update_interval(
+            self.scheduler.next_interval(self.budget.requests_remaining)
+        )
+        _LOGGER.debug("Next update in %s", self.update_interval)
+        self.cache.set(
+            ENDPOINT_CURRENT_CONDITIONS,
+            current.as_dict(),
+            self.accuweather.response_meta.get(ENDPOINT_CURRENT_CONDITIONS),
+            self.update_interval,
+        )
+        return current
+
+    async def _async_update_forecast(self):
+        """Fetch forecast."""
+        start = monotonic()
+        with timeout(10):
+            data = await self.accuweather.async_get_forecast(metric=True)
+        self.metrics.latency[ENDPOINT_FORECAST].observe(monotonic() - start)
+        forecast = [
+            ForecastDay.from_api(day, ATTR_UNIT_METRIC, self.forecast_fields)
+            for day in data[: self.forecast_days]
+        ]
+        self._forecast_next_update = utcnow() + FORECAST_UPDATE_INTERVAL
+        self.cache.set(
+            ENDPOINT_FORECAST,
+            {
+                "fields": sorted(self.forecast_fields or ForecastDay.FIELDS),
+                "days": [day.as_dict() for day in forecast],
+            },
+            self.accuweather.response_meta.get(ENDPOINT_FORECAST),
+            FORECAST_UPDATE_INTERVAL,
+        )
+        return forecast
+
+    async def _async_update_hourly_forecast(self):
+        """Fetch hourly forecast."""
+        start = monotonic()
+        with timeout(10):
+            data = await self.accuweather.async_get_hourly_forecast(
+                self.hourly_forecast, metric=True
+            )
+        self.metrics.latency[ENDPOINT_HOURLY_FORECAST].observe(monotonic() - start)
+        hourly = HourlyForecast.from_api(data)
+        self._hourly_next_update = utcnow() + HOURLY_FORECAST_UPDATE_INTERVAL
+        self.cache.set(
+            ENDPOINT_HOURLY_FORECAST,
+            hourly.as_dict(),
+            self.accuweather.response_meta.get(ENDPOINT_HOURLY_FORECAST),
+            HOURLY_FORECAST_UPDATE_INTERVAL,
+        )
+        return hourly
+
+    async def _async_update_historical_conditions(self, since: float):
+        """Fetch the observations of the past 24 hours to fill a gap."""
+        start = monotonic()
+        with timeout(10):
+            data = await self.accuweather.async_get_historical_conditions()
+        self.metrics.latency[ENDPOINT_HISTORICAL_CONDITIONS].observe(
+            monotonic() - start
+        )
+        observations = []
+        for item in data:
+            observation = CurrentConditions.from_api(item, ATTR_UNIT_METRIC)
+            fill_derived(observation)
+            observations.append(observation)
+        observations.sort(key=lambda observation: observation.epoch_time or 0)
+        return since, observations
+
+    def _backfill(self, since: float, observations: list):
+        """Feed the observations of the gap to the trends."""
+        _LOGGER.debug("Backfilling %s observations", len(observations))
+        for observation in observations:
+            if observation.epoch_time is not None and observation.epoch_time > since:
+                self.local.update(observation, observation.epoch_time, self._hourly)
+
+    async def async_refresh(self) -> None:
+        """Refresh data, joining the refresh in flight instead of starting another."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self.hass.async_create_task(super().async_refresh())
+        else:
+            self.metrics.coalesced["joined"] += 1
+        # A cancelled caller doesn't cancel the refresh the others are waiting for.
+        await asyncio.shield(self._refresh_task)
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, unless the last one is too recent for the quota.
+
+        Entity updates requested at once, e.g. by homeassistant.update_entity on all
+        AccuWeather entities, result in a single refresh.
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            await self.async_refresh()
+            return
+        spacing = self.scheduler.refresh_spacing(self.budget.requests_remaining)
+        if (
+            self._last_refresh is not None
+            and monotonic() - self._last_refresh < spacing.total_seconds()
+        ):
+            _LOGGER.debug(
+                "Refresh requested within %s of the last one, skipping", spacing
+            )
+            self.metrics.coalesced["spaced"] += 1
+            return
+        await self.async_refresh()
+
+    async def _async_update_data(self):
+        """Update data via library."""
+        self._last_refresh = monotonic()
+        _LOGGER.debug(
+            "State writes emitted: %s, skipped: %s",
+            self.metrics.state_writes["emitted"],
+            self.metrics.state_writes["skipped"],
+        )
+        restored = False
+        if self._restore_from_cache:
+            self._restore_from_cache = False
+            restored = self._restore_cached_data()
+
+        stages = {}
+        if not restored:
+            stages[ENDPOINT_CURRENT_CONDITIONS] = self._async_update_current_conditions
+        if self.forecast and self._forecast_next_update <= utcnow():
+            stages[ENDPOINT_FORECAST] = self._async_update_forecast
+        if self.hourly_forecast and self._hourly_next_update <= utcnow():
+            stages[ENDPOINT_HOURLY_FORECAST] = self._async_update_hourly_forecast
+        # One request recovers up to 24 hours of observations missed while Home
+        # Assistant was down or the updates failed.
+        if (
+            ENDPOINT_CURRENT_CONDITIONS in stages
+            and self._last_observed is not None
+            and self._next_backfill <= utcnow()
+            and utcnow().timestamp() - self._last_observed
+            > max(BACKFILL_GAP, 2 * self.update_interval).total_seconds()
+        ):
+            self._next_backfill = utcnow() + BACKFILL_INTERVAL
+            self.cache.set(
+                ENDPOINT_HISTORICAL_CONDITIONS, None, None, BACKFILL_INTERVAL
+            )
+            stages[ENDPOINT_HISTORICAL_CONDITIONS] = partial(
+                self._async_update_historical_conditions, self._last_observed
+            )
+
+        if stages and self.budget.exhausted and not self._rotate_api_key():
+            self._set_update_interval(self.budget.exhausted_until - utcnow())
+            raise UpdateFailed("The allowed number of requests has been exceeded")
+
+        # The stages run concurrently, a failed stage keeps the last good data of its
+        # section and marks the section as stale. Fetches of locations sharing the
+        # API key are staggered.
+        async with self.budget:
+            results = await asyncio.gather(
+                *[stage() for stage in stages.values()], return_exceptions=True
+            )
+        errors = {}
+        for section, result in zip(stages, results):
+            if section == ENDPOINT_HISTORICAL_CONDITIONS:
+                # The backfill is best effort, its errors don't fail the update.
+                if isinstance(result, RequestsExceededError):
+                    self.budget.set_exhausted()
+                if isinstance(result, Exception):
+                    self.metrics.record_error(result)
+                if isinstance(result, UPDATE_ERRORS):
+                    _LOGGER.debug("Error fetching %s: %s", section, repr(result))
+                elif isinstance(result, Exception):
+                    _LOGGER.error(
+                        "Unexpected error backfilling %s", section, exc_info=result
+                    )
+                else:
+                    self._backfill(*result)
+                continue
+            if isinstance(result, RequestsExceededError):
+                self.budget.set_exhausted()
+            if isinstance(result, Exception):
+                self.metrics.record_error(result)
+            if isinstance(result, UPDATE_ERRORS):
+                _LOGGER.debug("Error fetching %s: %s", section, repr(result))
+                errors[section] = result
+                self.stale_sections.add(section)
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                self.stale_sections.discard(section)
+                if section == ENDPOINT_CURRENT_CONDITIONS:
+                    self._current = result
+                elif section == ENDPOINT_FORECAST:
+                    self._forecast = result
+                else:
+                    self._hourly = result
+
+        current_error = errors.get(ENDPOINT_CURRENT_CONDITIONS)
+        if isinstance(current_error, InvalidApiKeyError):
+            self._invalid_api_keys.add(self.api_key)
+        if (
+            isinstance(current_error, (InvalidApiKeyError, RequestsExceededError))
+            and self._rotate_api_key()
+        ):
+            self._set_update_interval(RETRY_INTERVAL)
+        elif isinstance(current_error, InvalidApiKeyError):
+            self._request_reauth()
+            self._set_update_interval(self.update_interval)
+        elif isinstance(current_error, RequestsExceededError):
+            # Retrying is pointless before the quota is reset.
+            self._set_update_interval(self.budget.exhausted_until - utcnow())
+        elif current_error is not None and self.max_data_age:
+            self._failures += 1
+            self._set_update_interval(self._retry_interval())
+            _LOGGER.debug(
+                "Serving data from %s, retry in %s",
+                self.data_updated,
+                self.update_interval,
+            )
+        elif current_error is not None:
+            self._set_update_interval(self.update_interval)
+        elif ENDPOINT_CURRENT_CONDITIONS in stages:
+            self._failures = 0
+        if errors and (
+            len(errors) == len(stages)
+            or self._current is None
+            or (self.forecast and not self._forecast)
+            or (self.hourly_forecast and self._hourly is None)
+        ):
+            raise UpdateFailed(next(iter(errors.values())))
+        self.local.update(self._current, self.data_updated.timestamp(), self._hourly)
+        return AccuWeatherData(self._current, self._forecast, self._hourly)
@@ -0,0 +1,188 @@
+"""AccuWeather API client used by the integration."""
+import asyncio
+import json
+import logging
+from email.utils import parsedate_to_datetime
+
+from accuweather import AccuWeather, ApiError, InvalidApiKeyError, RequestsExceededError
+from accuweather.const import (
+    ATTR_CURRENT_CONDITIONS,
+    ATTR_FORECAST,
+    ENDPOINT,
+    HTTP_HEADERS,
+    HTTP_OK,
+    HTTP_UNAUTHORIZED,
+    REMOVE_FROM_CURRENT_CONDITION,
+    REMOVE_FROM_FORECAST,
+    REQUESTS_EXCEEDED,
+    URLS,
+)
+from aiohttp import ClientError
+from aiohttp.client_exceptions import ClientConnectorError
+
+from .const import (
+    ALERTS_URL,
+    ENDPOINT_ALERTS,
+    ENDPOINT_CURRENT_CONDITIONS,
+    ENDPOINT_FORECAST,
+    ENDPOINT_HISTORICAL_CONDITIONS,
+    ENDPOINT_HOURLY_FORECAST,
+    ENDPOINT_MINUTECAST,
+    HISTORICAL_CONDITIONS_URL,
+    HOURLY_FORECAST_URL,
+    MINUTECAST_URL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors of a fetch which keep the last good data of its section.
+UPDATE_ERRORS = (
+    ApiError,
+    ClientConnectorError,
+    ClientError,
+    InvalidApiKeyError,
+    RequestsExceededError,
+    asyncio.TimeoutError,
+)
+
+
+def validate_api_key(api_key: str):
+    """Raise InvalidApiKeyError if the API key has not the format of one."""
+    if not AccuWeather._valid_api_key(api_key):
+        raise InvalidApiKeyError(
+            "Your API Key must be a 32-character hexadecimal string"
+        )
+
+
+class AccuWeatherClient(AccuWeather):
+    """AccuWeather API client which keeps the metadata of the responses."""
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        api_key,
+        session,
+        latitude=None,
+        longitude=None,
+        location_key=None,
+        base_url=None,
+    ):
+        """Initialize."""
+        super().__init__(
+            api_key,
+            session,
+            latitude=latitude,
+            longitude=longitude,
+            location_key=location_key,
+        )
+        # The requests go to a caching proxy of the API if its URL is given.
+        self.base_url = base_url.rstrip("/") + "/" if base_url else ENDPOINT
+        self.response_meta = {}
+        self.bytes_received = 0
+
+    def set_api_key(self, api_key: str):
+        """Use another API key."""
+        validate_api_key(api_key)
+        self._api_key = api_key
+
+    def _construct_url(self, arg: str, **kwargs) -> str:
+        """Construct AccuWeather API URL."""
+        return self.base_url + URLS[arg].format(**kwargs)
+
+    @staticmethod
+    def _parse_expires(value):
+        """Return the Expires header as a timestamp."""
+        try:
+            return parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    async def _async_get_data(self, url: str, endpoint: str = None):
+        """Retrieve data from AccuWeather API and remember the response metadata."""
+        async with self._session.get(url, headers=HTTP_HEADERS) as resp:
+            if resp.status == HTTP_UNAUTHORIZED:
+                raise InvalidApiKeyError("Invalid API key")
+            if resp.status != HTTP_OK:
+                error_text = json.loads(await resp.text())
+                if error_text["Message"] == REQUESTS_EXCEEDED:
+                    raise RequestsExceededError(
+                        "The allowed number of requests has been exceeded"
+                    )
+                raise ApiError(f"Invalid response from AccuWeather API: {resp.status}")
+            _LOGGER.debug("Data retrieved from %s, status: %s", url, resp.status)
+            body = await resp.read()
+        self.bytes_received += len(body)
+        data = json.loads(body)
+        self._requests_remaining = resp.headers["RateLimit-Remaining"]
+        if endpoint is not None:
+            self.response_meta[endpoint] = {
+                "etag": resp.headers.get("ETag"),
+                "expires": self._parse_expires(resp.headers.get("Expires")),
+            }
+        return data
+
+    async def async_get_current_conditions(self):
+        """Retrieve current conditions data from AccuWeather."""
+        if not self._location_key:
+            await self.async_get_location()
+        url = self._construct_url(
+            ATTR_CURRENT_CONDITIONS,
+            api_key=self._api_key,
+            location_key=self._location_key,
+        )
+        data = await self._async_get_data(url, ENDPOINT_CURRENT_CONDITIONS)
+        return self._clean_current_condition(data[0], REMOVE_FROM_CURRENT_CONDITION)
+
+    async def async_get_forecast(self, metric=True):
+        """Retrieve forecast data from AccuWeather."""
+        if not self._location_key:
+            await self.async_get_location()
+        url = self._construct_url(
+            ATTR_FORECAST,
+            api_key=self._api_key,
+            location_key=self._location_key,
+            metric=str(metric),
+        )
+        data = await self._async_get_data(url, ENDPOINT_FORECAST)
+        return self._parse_forecast(data, REMOVE_FROM_FORECAST)
+
+    async def async_get_hourly_forecast(self, hours: int, metric=True):
+        """Retrieve hourly forecast data from AccuWeather."""
+        if not self._location_key:
+            await self.async_get_location()
+        url = self.base_url + HOURLY_FORECAST_URL.format(
+            hours=hours,
+            api_key=self._api_key,
+            location_key=self._location_key,
+            metric=str(metric),
+        )
+        return await self._async_get_data(url, ENDPOINT_HOURLY_FORECAST)
+
+    async def async_get_historical_conditions(self):
+        """Retrieve current conditions of the past 24 hours from AccuWeather."""
+        if not self._location_key:
+            await self.async_get_location()
+        url = self.base_url + HISTORICAL_CONDITIONS_URL.format(
+            api_key=self._api_key, location_key=self._location_key
+        )
+        data = await self._async_get_data(url, ENDPOINT_HISTORICAL_CONDITIONS)
+        # The time of each observation is needed to place it in the gap.
+        to_remove = tuple(
+            key for key in REMOVE_FROM_CURRENT_CONDITION if key != "EpochTime"
+        )
+        return [self._clean_current_condition(item, to_remove) for item in data]
+
+    async def async_get_alerts(self):
+        """Retrieve severe weather alerts from AccuWeather."""
+        if not self._location_key:
+            await self.async_get_location()
+        url = self.base_url + ALERTS_URL.format(
+            api_key=self._api_key, location_key=self._location_key
+        )
+        return await self._async_get_data(url, ENDPOINT_ALERTS)
+
+    async def async_get_minutecast(self, latitude: float, longitude: float):
+        """Retrieve minute by minute precipitation forecast from AccuWeather."""
+        url = self.base_url + MINUTECAST_URL.format(
+            api_key=self._api_key, latitude=latitude, longitude=longitude
+        )
+        return await self._async_get_data(url, ENDPOINT_MINUTECAST)
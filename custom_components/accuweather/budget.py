@@ -0,0 +1,97 @@
+"""Shared request budget of an AccuWeather API key."""
+import asyncio
+import logging
+from datetime import timedelta
+from time import monotonic
+
+from homeassistant.util.dt import utcnow
+
+from .const import BUDGETS, DOMAIN, FETCH_SPACING
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_budget(hass, api_key: str) -> "RequestBudget":
+    """Return the budget shared by the locations using the API key."""
+    budgets = hass.data[DOMAIN].setdefault(BUDGETS, {})
+    if api_key not in budgets:
+        budgets[api_key] = RequestBudget()
+    return budgets[api_key]
+
+
+def release_budget(hass, api_key: str, coordinator):
+    """Unregister the coordinator and drop the budgets no location uses.
+
+    The budget of an exhausted API key is kept until the reset, the locations which
+    switched to other API keys don't try it again before.
+    """
+    budgets = hass.data[DOMAIN][BUDGETS]
+    budgets[api_key].unregister(coordinator)
+    for unused in [
+        key for key, budget in budgets.items() if not budget and not budget.exhausted
+    ]:
+        budgets.pop(unused)
+
+
+class RequestBudget:
+    """Allocate the daily requests of one API key between locations."""
+
+    def __init__(self):
+        """Initialize."""
+        self.requests_remaining = None
+        self.exhausted_until = None
+        self._priorities = {}
+        self._lock = asyncio.Lock()
+        self._last_fetch = 0
+
+    def __len__(self):
+        """Return the number of registered locations."""
+        return len(self._priorities)
+
+    @property
+    def exhausted(self) -> bool:
+        """Return True if the quota is known to be exhausted."""
+        return self.exhausted_until is not None and utcnow() < self.exhausted_until
+
+    def register(self, coordinator, priority: int):
+        """Register a location coordinator with its priority."""
+        self._priorities[coordinator] = priority
+        self._update_shares()
+
+    def unregister(self, coordinator):
+        """Unregister a location coordinator."""
+        self._priorities.pop(coordinator, None)
+        self._update_shares()
+
+    def _update_shares(self):
+        """Weight the share of the quota of each location by its priority."""
+        total = sum(self._priorities.values())
+        for coordinator, priority in self._priorities.items():
+            coordinator.scheduler.share = priority / total
+            _LOGGER.debug(
+                "Location %s gets %.0f%% of requests",
+                coordinator.location_key,
+                coordinator.scheduler.share * 100,
+            )
+
+    def set_exhausted(self):
+        """Mark the quota as exhausted until the reset at midnight UTC."""
+        self.exhausted_until = (utcnow() + timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+    async def __aenter__(self):
+        """Wait for the turn of the next fetch, fetches are spaced not to burst."""
+        await self._lock.acquire()
+        delay = self._last_fetch + FETCH_SPACING - monotonic()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._lock.release()
+                raise
+
+    async def __aexit__(self, *args):
+        """Finish the fetch."""
+        self._last_fetch = monotonic()
+        self._lock.release()
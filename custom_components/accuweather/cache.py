@@ -0,0 +1,67 @@
+"""Persistent cache of AccuWeather API responses."""
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util.dt import utcnow
+
+from .const import DOMAIN, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+SAVE_DELAY = 10
+
+
+class CacheStore(Store):
+    """Store of the cache."""
+
+    async def _async_migrate_func(self, old_version, old_data):
+        """Drop the cache stored in an older format."""
+        return {}
+
+
+class AccuWeatherCache:
+    """Store API responses with their fetch time and validity metadata."""
+
+    def __init__(self, hass, location_key):
+        """Initialize."""
+        self._store = CacheStore(hass, STORAGE_VERSION, f"{DOMAIN}.{location_key}")
+        self._data = {}
+
+    async def async_load(self):
+        """Load cached responses from the disk."""
+        self._data = await self._store.async_load() or {}
+        _LOGGER.debug("Loaded cached sections: %s", list(self._data))
+
+    def get(self, section: str) -> Optional[dict]:
+        """Return the cached section entry if it is still fresh."""
+        entry = self._data.get(section)
+        if entry is None or entry["valid_until"] <= utcnow().timestamp():
+            return None
+        return entry
+
+    def fetched(self, section: str) -> Optional[float]:
+        """Return the fetch time of the cached section, even if it isn't fresh."""
+        entry = self._data.get(section)
+        return entry["fetched"] if entry is not None else None
+
+    def set(self, section: str, data, meta: Optional[dict], interval: timedelta):
+        """Store the section and schedule writing the cache to the disk."""
+        meta = meta or {}
+        fetched = utcnow().timestamp()
+        # The data is not refetched before the next scheduled update even if the
+        # server marks it as expired earlier, a restart should not cost a request.
+        valid_until = max(fetched + interval.total_seconds(), meta.get("expires") or 0)
+        self._data[section] = {
+            "data": data,
+            "fetched": fetched,
+            "valid_until": valid_until,
+            "etag": meta.get("etag"),
+            "expires": meta.get("expires"),
+        }
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+    async def async_remove(self):
+        """Remove the cache from the disk."""
+        await self._store.async_remove()
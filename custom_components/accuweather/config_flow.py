@@ -3,7 +3,7 @@ import asyncio
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from accuweather import AccuWeather, ApiError, InvalidApiKeyError, RequestsExceededError
+from accuweather import ApiError, InvalidApiKeyError, RequestsExceededError
 from aiohttp import ClientError
 from aiohttp.client_exceptions import ClientConnectorError
 from async_timeout import timeout
@@ -12,7 +12,54 @@ from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, CON
 from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import CONF_FORECAST, DOMAIN  # pylint:disable=unused-import
+from .api import AccuWeatherClient, validate_api_key
+from .const import (  # pylint:disable=unused-import
+    ATTR_LOCATION_KEY,
+    CONF_ALERTS,
+    CONF_API_KEYS,
+    CONF_BASE_URL,
+    CONF_FORECAST,
+    CONF_FORECAST_DAYS,
+    CONF_HOURLY_FORECAST,
+    CONF_MAX_DATA_AGE,
+    CONF_MINUTECAST,
+    CONF_PRIORITY,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_PRIORITY,
+    DOMAIN,
+    HOURLY_FORECAST_HOURS,
+    MAX_FORECAST_DAYS,
+)
+from .locations import async_get_location_cache
+
+
+async def _async_get_current_conditions(api_key, session, location_key):
+    """Fetch current conditions to check the API key."""
+    accuweather = AccuWeatherClient(api_key, session, location_key=location_key)
+    with timeout(10):
+        await accuweather.async_get_current_conditions()
+
+
+async def _async_check_api(request) -> tuple:
+    """Return the result of the API request and the form errors."""
+    try:
+        return await request, {}
+    except (ApiError, ClientConnectorError, asyncio.TimeoutError, ClientError):
+        return None, {"base": "cannot_connect"}
+    except InvalidApiKeyError:
+        return None, {CONF_API_KEY: "invalid_api_key"}
+    except RequestsExceededError:
+        return None, {CONF_API_KEY: "requests_exceeded"}
+
+
+def _api_key_errors(field: str, api_keys: list) -> dict:
+    """Return the form errors of API keys which have not the format of one."""
+    try:
+        for api_key in api_keys:
+            validate_api_key(api_key)
+    except InvalidApiKeyError:
+        return {field: "invalid_api_key"}
+    return {}
 
 
 class AccuWeatherFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,36 +68,29 @@ class AccuWeatherFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
+    def __init__(self):
+        """Initialize."""
+        self._reauth_entry = None
+
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
-        # Under the terms of use of the API, one user can use one free API key. Due to
-        # the small number of requests allowed, we only allow one integration instance.
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
-
         errors = {}
 
         if user_input is not None:
             websession = async_get_clientsession(self.hass)
-            try:
-                with timeout(10):
-                    accuweather = AccuWeather(
-                        user_input[CONF_API_KEY],
-                        websession,
-                        latitude=user_input[CONF_LATITUDE],
-                        longitude=user_input[CONF_LONGITUDE],
-                    )
-                    await accuweather.async_get_location()
-            except (ApiError, ClientConnectorError, asyncio.TimeoutError, ClientError):
-                errors["base"] = "cannot_connect"
-            except InvalidApiKeyError:
-                errors[CONF_API_KEY] = "invalid_api_key"
-            except RequestsExceededError:
-                errors[CONF_API_KEY] = "requests_exceeded"
-            else:
-                await self.async_set_unique_id(
-                    accuweather.location_key, raise_on_progress=False
+            # Retrying the flow doesn't use requests once the location is resolved.
+            locations = await async_get_location_cache(self.hass)
+            location_key, errors = await _async_check_api(
+                locations.async_get_location_key(
+                    user_input[CONF_API_KEY],
+                    websession,
+                    user_input[CONF_LATITUDE],
+                    user_input[CONF_LONGITUDE],
                 )
+            )
+            if not errors:
+                await self.async_set_unique_id(location_key, raise_on_progress=False)
+                self._abort_if_unique_id_configured()
 
                 return self.async_create_entry(
                     title=user_input[CONF_NAME], data=user_input
@@ -75,6 +115,48 @@ class AccuWeatherFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_reauth(self, user_input=None):
+        """Handle a flow started when the API keys of an entry stopped working."""
+        self._reauth_entry = await self.async_set_unique_id(
+            user_input[ATTR_LOCATION_KEY]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Replace the API key of the entry, the entities and data are kept."""
+        if self._reauth_entry is None or (
+            self.hass.config_entries.async_get_entry(self._reauth_entry.entry_id)
+            is None
+        ):
+            # The entry was removed while the flow was pending.
+            return self.async_abort(reason="reauth_entry_removed")
+
+        errors = {}
+
+        if user_input is not None:
+            websession = async_get_clientsession(self.hass)
+            _, errors = await _async_check_api(
+                _async_get_current_conditions(
+                    user_input[CONF_API_KEY], websession, self._reauth_entry.unique_id
+                )
+            )
+            if not errors:
+                self.hass.config_entries.async_update_entry(
+                    self._reauth_entry,
+                    data={
+                        **self._reauth_entry.data,
+                        CONF_API_KEY: user_input[CONF_API_KEY],
+                    },
+                )
+                return self.async_abort(reason="reauth_successful")
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_API_KEY): str}),
+            description_placeholders={"name": self._reauth_entry.title},
+            errors=errors,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -95,8 +177,39 @@ class AccuWeatherOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
+        errors = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # The API keys are a part of the entry data, changing them doesn't
+            # reload the entry.
+            options = dict(user_input)
+            api_key = options.pop(CONF_API_KEY).strip()
+            api_keys = [
+                key.strip()
+                for key in options.pop(CONF_API_KEYS).split(",")
+                if key.strip()
+            ]
+            # The API keys are checked when they are used, only their format can be
+            # checked without spending requests.
+            errors = _api_key_errors(CONF_API_KEY, [api_key])
+            errors.update(_api_key_errors(CONF_API_KEYS, api_keys))
+            options[CONF_BASE_URL] = options.get(CONF_BASE_URL, "").strip()
+            if options[CONF_BASE_URL]:
+                try:
+                    cv.url(options[CONF_BASE_URL])
+                except vol.Invalid:
+                    errors[CONF_BASE_URL] = "invalid_url"
+            if not errors:
+                data = {
+                    **self.config_entry.data,
+                    CONF_API_KEY: api_key,
+                    CONF_API_KEYS: api_keys,
+                }
+                if data != self.config_entry.data:
+                    self.hass.config_entries.async_update_entry(
+                        self.config_entry, data=data
+                    )
+                return self.async_create_entry(title="", data=options)
 
         return self.async_show_form(
             step_id="user",
@@ -105,7 +218,53 @@ class AccuWeatherOptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Optional(
                         CONF_FORECAST,
                         default=self.config_entry.options.get(CONF_FORECAST, False),
-                    ): bool
+                    ): bool,
+                    vol.Optional(
+                        CONF_FORECAST_DAYS,
+                        default=self.config_entry.options.get(
+                            CONF_FORECAST_DAYS, MAX_FORECAST_DAYS
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_FORECAST_DAYS)
+                    ),
+                    vol.Optional(
+                        CONF_HOURLY_FORECAST,
+                        default=self.config_entry.options.get(CONF_HOURLY_FORECAST, 0),
+                    ): vol.In(HOURLY_FORECAST_HOURS),
+                    vol.Optional(
+                        CONF_ALERTS,
+                        default=self.config_entry.options.get(CONF_ALERTS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MINUTECAST,
+                        default=self.config_entry.options.get(CONF_MINUTECAST, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MAX_DATA_AGE,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_API_KEY, default=self.config_entry.data[CONF_API_KEY]
+                    ): str,
+                    vol.Optional(
+                        CONF_API_KEYS,
+                        default=", ".join(
+                            self.config_entry.data.get(CONF_API_KEYS, [])
+                        ),
+                    ): str,
+                    vol.Optional(
+                        CONF_PRIORITY,
+                        default=self.config_entry.options.get(
+                            CONF_PRIORITY, DEFAULT_PRIORITY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                    vol.Optional(
+                        CONF_BASE_URL,
+                        default=self.config_entry.options.get(CONF_BASE_URL, ""),
+                    ): str,
                 }
             ),
+            errors=errors,
         )
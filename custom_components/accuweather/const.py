@@ -1,31 +1,85 @@
 """Constants for AccuWeather integration."""
+from datetime import timedelta
+
 from homeassistant.const import (
     ATTR_DEVICE_CLASS,
+    DATA_BYTES,
     DEVICE_CLASS_TEMPERATURE,
     LENGTH_FEET,
     LENGTH_INCHES,
     LENGTH_METERS,
+    PRESSURE_INHG,
+    PRESSURE_MBAR,
     SPEED_KILOMETERS_PER_HOUR,
     SPEED_MILES_PER_HOUR,
     TEMP_CELSIUS,
     TEMP_FAHRENHEIT,
     TIME_HOURS,
+    TIME_MILLISECONDS,
     UNIT_PERCENTAGE,
     UV_INDEX,
     VOLUME_CUBIC_METERS,
 )
 
+# Data path of the listeners notified about every update.
+ALL_FIELDS = "*"
 ATTRIBUTION = "Data provided by AccuWeather"
+ATTR_AGGREGATE = "aggregate"
+ATTR_ATTRIBUTES = "attributes"
+ATTR_DATA_AGE = "data_age"
+ATTR_ENDPOINT = "endpoint"
+ATTR_FIELD = "field"
 ATTR_ICON = "icon"
 ATTR_FORECAST = "forecast"
 ATTR_LABEL = "label"
+ATTR_LOCATION_KEY = "location_key"
+ATTR_LOCATIONS = "locations"
+ATTR_NEXT_UPDATE = "next_update"
+ATTR_STALE = "stale"
 ATTR_UNIT_IMPERIAL = "Imperial"
 ATTR_UNIT_METRIC = "Metric"
+# Gaps between the observations longer than this are backfilled, once per interval.
+BACKFILL_GAP = timedelta(hours=2)
+BACKFILL_INTERVAL = timedelta(days=1)
+BUDGETS = "budgets"
 CONCENTRATION_PARTS_PER_CUBIC_METER = f"p/{VOLUME_CUBIC_METERS}"
+CONF_ALERTS = "alerts"
+CONF_API_KEYS = "api_keys"
+CONF_BASE_URL = "base_url"
 CONF_FORECAST = "forecast"
+CONF_FORECAST_DAYS = "forecast_days"
+CONF_HOURLY_FORECAST = "hourly_forecast"
+CONF_MAX_DATA_AGE = "max_data_age"
+CONF_MINUTECAST = "minutecast"
+CONF_PRIORITY = "priority"
 COORDINATOR = "coordinator"
+# Minutes the last good data is served when updates fail, 0 disables it.
+DEFAULT_MAX_DATA_AGE = 180
+DEFAULT_PRIORITY = 1
 DOMAIN = "accuweather"
+ENDPOINT_ALERTS = "alerts"
+ENDPOINT_CURRENT_CONDITIONS = "current_conditions"
+ENDPOINT_FORECAST = "forecast"
+ENDPOINT_HISTORICAL_CONDITIONS = "historical_conditions"
+ENDPOINT_HOURLY_FORECAST = "hourly_forecast"
+ENDPOINT_MINUTECAST = "minutecast"
+FETCH_SPACING = 5
 LENGTH_MILIMETERS = "mm"
+# Geopositions are rounded to about 1 km when caching their location keys.
+LOCATION_PRECISION = 2
+LOCATIONS = "locations"
+LOCATIONS_STORAGE_VERSION = 1
+MIN_UPDATE_INTERVAL = timedelta(minutes=10)
+OPTIONS = "options"
+# We have 50 requests allowed per day, we leave 5 as a reserve for restarting HA.
+REQUESTS_PER_DAY = 50
+REQUESTS_RESERVE = 5
+# Observations kept for the trends, about a few hours of updates.
+TREND_SAMPLES = 12
+# First retry after a failed update, doubled with each next failure.
+RETRY_INTERVAL = timedelta(minutes=2)
+SERVICE_IMPORT_LOCATIONS = "import_locations"
+STORAGE_VERSION = 4
 UNDO_UPDATE_LISTENER = "undo_update_listener"
 
 CONDITION_CLASSES = {
@@ -45,11 +99,192 @@ CONDITION_CLASSES = {
     "windy": [32],
 }
 
-FORECAST_DAYS = [0, 1, 2, 3, 4]
+CONDITION_MAP = {
+    icon: condition for condition, icons in CONDITION_CLASSES.items() for icon in icons
+}
+
+DIAGNOSTIC_SENSOR_TYPES = {
+    "BytesReceived": {
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "bytes_received",
+        ATTR_ICON: "mdi:download-network",
+        ATTR_LABEL: "Bytes Received",
+        ATTR_UNIT_METRIC: DATA_BYTES,
+        ATTR_UNIT_IMPERIAL: DATA_BYTES,
+    },
+    "CoalescedRefreshes": {
+        ATTR_ATTRIBUTES: {"joined": "coalesced_joined", "spaced": "coalesced_spaced"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "coalesced_refreshes",
+        ATTR_ICON: "mdi:call-merge",
+        ATTR_LABEL: "Coalesced Refreshes",
+        ATTR_UNIT_METRIC: None,
+        ATTR_UNIT_IMPERIAL: None,
+    },
+    "Errors": {
+        ATTR_ATTRIBUTES: {"types": "error_types"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "errors",
+        ATTR_ICON: "mdi:alert-circle-outline",
+        ATTR_LABEL: "Errors",
+        ATTR_UNIT_METRIC: None,
+        ATTR_UNIT_IMPERIAL: None,
+    },
+    "LatencyAlerts": {
+        ATTR_ATTRIBUTES: {"histogram": "latency_alerts_histogram"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_ENDPOINT: ENDPOINT_ALERTS,
+        ATTR_FIELD: "latency_alerts",
+        ATTR_ICON: "mdi:timer-outline",
+        ATTR_LABEL: "Alerts Latency",
+        ATTR_UNIT_METRIC: TIME_MILLISECONDS,
+        ATTR_UNIT_IMPERIAL: TIME_MILLISECONDS,
+    },
+    "LatencyCurrentConditions": {
+        ATTR_ATTRIBUTES: {"histogram": "latency_current_conditions_histogram"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_ENDPOINT: ENDPOINT_CURRENT_CONDITIONS,
+        ATTR_FIELD: "latency_current_conditions",
+        ATTR_ICON: "mdi:timer-outline",
+        ATTR_LABEL: "Current Conditions Latency",
+        ATTR_UNIT_METRIC: TIME_MILLISECONDS,
+        ATTR_UNIT_IMPERIAL: TIME_MILLISECONDS,
+    },
+    "LatencyForecast": {
+        ATTR_ATTRIBUTES: {"histogram": "latency_forecast_histogram"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_ENDPOINT: ENDPOINT_FORECAST,
+        ATTR_FIELD: "latency_forecast",
+        ATTR_ICON: "mdi:timer-outline",
+        ATTR_LABEL: "Forecast Latency",
+        ATTR_UNIT_METRIC: TIME_MILLISECONDS,
+        ATTR_UNIT_IMPERIAL: TIME_MILLISECONDS,
+    },
+    "LatencyHistoricalConditions": {
+        ATTR_ATTRIBUTES: {"histogram": "latency_historical_conditions_histogram"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_ENDPOINT: ENDPOINT_HISTORICAL_CONDITIONS,
+        ATTR_FIELD: "latency_historical_conditions",
+        ATTR_ICON: "mdi:timer-outline",
+        ATTR_LABEL: "Historical Conditions Latency",
+        ATTR_UNIT_METRIC: TIME_MILLISECONDS,
+        ATTR_UNIT_IMPERIAL: TIME_MILLISECONDS,
+    },
+    "LatencyHourlyForecast": {
+        ATTR_ATTRIBUTES: {"histogram": "latency_hourly_forecast_histogram"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_ENDPOINT: ENDPOINT_HOURLY_FORECAST,
+        ATTR_FIELD: "latency_hourly_forecast",
+        ATTR_ICON: "mdi:timer-outline",
+        ATTR_LABEL: "Hourly Forecast Latency",
+        ATTR_UNIT_METRIC: TIME_MILLISECONDS,
+        ATTR_UNIT_IMPERIAL: TIME_MILLISECONDS,
+    },
+    "LatencyMinuteCast": {
+        ATTR_ATTRIBUTES: {"histogram": "latency_minutecast_histogram"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_ENDPOINT: ENDPOINT_MINUTECAST,
+        ATTR_FIELD: "latency_minutecast",
+        ATTR_ICON: "mdi:timer-outline",
+        ATTR_LABEL: "MinuteCast Latency",
+        ATTR_UNIT_METRIC: TIME_MILLISECONDS,
+        ATTR_UNIT_IMPERIAL: TIME_MILLISECONDS,
+    },
+    "RenderTime": {
+        ATTR_ATTRIBUTES: {
+            "emitted": "state_writes_emitted",
+            "skipped": "state_writes_skipped",
+            "notified": "notifications_notified",
+            "filtered": "notifications_filtered",
+        },
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "render_time_per_write",
+        ATTR_ICON: "mdi:timer-outline",
+        ATTR_LABEL: "State Render Time",
+        ATTR_UNIT_METRIC: TIME_MILLISECONDS,
+        ATTR_UNIT_IMPERIAL: TIME_MILLISECONDS,
+    },
+    "RequestsRemaining": {
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "requests_remaining",
+        ATTR_ICON: "mdi:counter",
+        ATTR_LABEL: "Requests Remaining",
+        ATTR_UNIT_METRIC: None,
+        ATTR_UNIT_IMPERIAL: None,
+    },
+}
+
+MAX_FORECAST_DAYS = 5
+
+ALERTS_URL = "alerts/v1/{location_key}?apikey={api_key}&details=true"
+
+HISTORICAL_CONDITIONS_URL = (
+    "currentconditions/v1/{location_key}/historical/24?apikey={api_key}&details=true"
+)
+
+# Hours of the hourly forecast which can be configured, 0 disables it. The free API
+# key allows only the 12 hours forecast.
+HOURLY_FORECAST_HOURS = [0, 12, 24, 72]
+HOURLY_FORECAST_UPDATE_INTERVAL = timedelta(hours=3)
+HOURLY_FORECAST_URL = (
+    "forecasts/v1/hourly/{hours}hour/{location_key}"
+    "?apikey={api_key}&details=true&metric={metric}"
+)
+
+HOURLY_SENSOR_TYPES = {
+    "PrecipitationHourly": {
+        ATTR_AGGREGATE: "sum_over",
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "precipitation",
+        ATTR_ICON: "mdi:weather-rainy",
+        ATTR_LABEL: "Precipitation",
+        ATTR_UNIT_METRIC: LENGTH_MILIMETERS,
+        ATTR_UNIT_IMPERIAL: LENGTH_INCHES,
+    },
+    "PrecipitationProbabilityMaxHourly": {
+        ATTR_AGGREGATE: "max_over",
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "precipitation_probability",
+        ATTR_ICON: "mdi:weather-rainy",
+        ATTR_LABEL: "Precipitation Probability Max",
+        ATTR_UNIT_METRIC: UNIT_PERCENTAGE,
+        ATTR_UNIT_IMPERIAL: UNIT_PERCENTAGE,
+    },
+    "TemperatureMaxHourly": {
+        ATTR_AGGREGATE: "max_over",
+        ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "temperature",
+        ATTR_ICON: None,
+        ATTR_LABEL: "Temperature Max",
+        ATTR_UNIT_METRIC: TEMP_CELSIUS,
+        ATTR_UNIT_IMPERIAL: TEMP_FAHRENHEIT,
+    },
+    "TemperatureMinHourly": {
+        ATTR_AGGREGATE: "min_over",
+        ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "temperature",
+        ATTR_ICON: None,
+        ATTR_LABEL: "Temperature Min",
+        ATTR_UNIT_METRIC: TEMP_CELSIUS,
+        ATTR_UNIT_IMPERIAL: TEMP_FAHRENHEIT,
+    },
+    "WindGustMaxHourly": {
+        ATTR_AGGREGATE: "max_over",
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "wind_gust",
+        ATTR_ICON: "mdi:weather-windy",
+        ATTR_LABEL: "Wind Gust Max",
+        ATTR_UNIT_METRIC: SPEED_KILOMETERS_PER_HOUR,
+        ATTR_UNIT_IMPERIAL: SPEED_MILES_PER_HOUR,
+    },
+}
+
+FORECAST_UPDATE_INTERVAL = timedelta(hours=12)
 
 FORECAST_SENSOR_TYPES = {
     "CloudCoverDay": {
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "cloud_cover_day",
         ATTR_ICON: "mdi:weather-cloudy",
         ATTR_LABEL: "Cloud Cover Day",
         ATTR_UNIT_METRIC: UNIT_PERCENTAGE,
@@ -57,13 +292,16 @@ FORECAST_SENSOR_TYPES = {
     },
     "CloudCoverNight": {
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "cloud_cover_night",
         ATTR_ICON: "mdi:weather-cloudy",
         ATTR_LABEL: "Cloud Cover Night",
         ATTR_UNIT_METRIC: UNIT_PERCENTAGE,
         ATTR_UNIT_IMPERIAL: UNIT_PERCENTAGE,
     },
     "Grass": {
+        ATTR_ATTRIBUTES: {"level": "grass_level"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "grass",
         ATTR_ICON: "mdi:grass",
         ATTR_LABEL: "Grass Pollen",
         ATTR_UNIT_METRIC: CONCENTRATION_PARTS_PER_CUBIC_METER,
@@ -71,27 +309,34 @@ FORECAST_SENSOR_TYPES = {
     },
     "HoursOfSun": {
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "hours_of_sun",
         ATTR_ICON: "mdi:weather-partly-cloudy",
         ATTR_LABEL: "Hours Of Sun",
         ATTR_UNIT_METRIC: TIME_HOURS,
         ATTR_UNIT_IMPERIAL: TIME_HOURS,
     },
     "Mold": {
+        ATTR_ATTRIBUTES: {"level": "mold_level"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "mold",
         ATTR_ICON: "mdi:blur",
         ATTR_LABEL: "Mold Pollen",
         ATTR_UNIT_METRIC: CONCENTRATION_PARTS_PER_CUBIC_METER,
         ATTR_UNIT_IMPERIAL: CONCENTRATION_PARTS_PER_CUBIC_METER,
     },
     "Ozone": {
+        ATTR_ATTRIBUTES: {"level": "ozone_level"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "ozone",
         ATTR_ICON: "mdi:vector-triangle",
         ATTR_LABEL: "Ozone",
         ATTR_UNIT_METRIC: None,
         ATTR_UNIT_IMPERIAL: None,
     },
     "Ragweed": {
+        ATTR_ATTRIBUTES: {"level": "ragweed_level"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "ragweed",
         ATTR_ICON: "mdi:sprout",
         ATTR_LABEL: "Ragweed Pollen",
         ATTR_UNIT_METRIC: CONCENTRATION_PARTS_PER_CUBIC_METER,
@@ -99,6 +344,7 @@ FORECAST_SENSOR_TYPES = {
     },
     "RealFeelTemperatureMax": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "real_feel_temperature_max",
         ATTR_ICON: None,
         ATTR_LABEL: "RealFeel Temperature Max",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -106,6 +352,7 @@ FORECAST_SENSOR_TYPES = {
     },
     "RealFeelTemperatureMin": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "real_feel_temperature_min",
         ATTR_ICON: None,
         ATTR_LABEL: "RealFeel Temperature Min",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -113,6 +360,7 @@ FORECAST_SENSOR_TYPES = {
     },
     "RealFeelTemperatureShadeMax": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "real_feel_temperature_shade_max",
         ATTR_ICON: None,
         ATTR_LABEL: "RealFeel Temperature Shade Max",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -120,6 +368,7 @@ FORECAST_SENSOR_TYPES = {
     },
     "RealFeelTemperatureShadeMin": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "real_feel_temperature_shade_min",
         ATTR_ICON: None,
         ATTR_LABEL: "RealFeel Temperature Shade Min",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -127,6 +376,7 @@ FORECAST_SENSOR_TYPES = {
     },
     "ThunderstormProbabilityDay": {
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "thunderstorm_probability_day",
         ATTR_ICON: "mdi:weather-lightning",
         ATTR_LABEL: "Thunderstorm Probability Day",
         ATTR_UNIT_METRIC: UNIT_PERCENTAGE,
@@ -134,34 +384,43 @@ FORECAST_SENSOR_TYPES = {
     },
     "ThunderstormProbabilityNight": {
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "thunderstorm_probability_night",
         ATTR_ICON: "mdi:weather-lightning",
         ATTR_LABEL: "Thunderstorm Probability Night",
         ATTR_UNIT_METRIC: UNIT_PERCENTAGE,
         ATTR_UNIT_IMPERIAL: UNIT_PERCENTAGE,
     },
     "Tree": {
+        ATTR_ATTRIBUTES: {"level": "tree_level"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "tree",
         ATTR_ICON: "mdi:tree-outline",
         ATTR_LABEL: "Tree Pollen",
         ATTR_UNIT_METRIC: CONCENTRATION_PARTS_PER_CUBIC_METER,
         ATTR_UNIT_IMPERIAL: CONCENTRATION_PARTS_PER_CUBIC_METER,
     },
     "UVIndex": {
+        ATTR_ATTRIBUTES: {"level": "uv_index_level"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "uv_index",
         ATTR_ICON: "mdi:weather-sunny",
         ATTR_LABEL: "UV Index",
         ATTR_UNIT_METRIC: UV_INDEX,
         ATTR_UNIT_IMPERIAL: UV_INDEX,
     },
     "WindGustDay": {
+        ATTR_ATTRIBUTES: {"direction": "wind_gust_day_direction"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "wind_gust_day",
         ATTR_ICON: "mdi:weather-windy",
         ATTR_LABEL: "Wind Gust Day",
         ATTR_UNIT_METRIC: SPEED_KILOMETERS_PER_HOUR,
         ATTR_UNIT_IMPERIAL: SPEED_MILES_PER_HOUR,
     },
     "WindGustNight": {
+        ATTR_ATTRIBUTES: {"direction": "wind_gust_night_direction"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "wind_gust_night",
         ATTR_ICON: "mdi:weather-windy",
         ATTR_LABEL: "Wind Gust Night",
         ATTR_UNIT_METRIC: SPEED_KILOMETERS_PER_HOUR,
@@ -169,6 +428,86 @@ FORECAST_SENSOR_TYPES = {
     },
 }
 
+# Forecast fields used by the weather entity.
+WEATHER_FORECAST_FIELDS = (
+    "epoch_date",
+    "icon_day",
+    "ozone",
+    "precipitation",
+    "precipitation_probability",
+    "temperature_max",
+    "temperature_min",
+    "wind_bearing_day",
+    "wind_speed_day",
+)
+
+MINUTECAST_URL = "forecasts/v1/minute?q={latitude},{longitude}&apikey={api_key}"
+
+# The alerts and the MinuteCast are polled slowly, and fast while precipitation is
+# reported or its probability in the next hours reaches the threshold.
+# Fast updates of a day are limited, their requests are reserved.
+NOWCAST_BURST_UPDATES_PER_DAY = 16
+NOWCAST_FAST_INTERVAL = timedelta(minutes=15)
+NOWCAST_HOURS = 2
+NOWCAST_PRECIPITATION_PROBABILITY = 50
+NOWCAST_SLOW_INTERVAL = timedelta(hours=2)
+
+NOWCAST_SENSOR_TYPES = {
+    "Alerts": {
+        ATTR_ATTRIBUTES: {"alerts": "alert_details"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_ENDPOINT: ENDPOINT_ALERTS,
+        ATTR_FIELD: "alert_count",
+        ATTR_ICON: "mdi:alert",
+        ATTR_LABEL: "Alerts",
+        ATTR_UNIT_METRIC: None,
+        ATTR_UNIT_IMPERIAL: None,
+    },
+    "MinuteCast": {
+        ATTR_ATTRIBUTES: {
+            "type": "minutecast.precipitation_type",
+            "start_minute": "minutecast.precipitation_start",
+            "end_minute": "minutecast.precipitation_end",
+        },
+        ATTR_DEVICE_CLASS: None,
+        ATTR_ENDPOINT: ENDPOINT_MINUTECAST,
+        ATTR_FIELD: "minutecast.phrase",
+        ATTR_ICON: "mdi:weather-pouring",
+        ATTR_LABEL: "MinuteCast",
+        ATTR_UNIT_METRIC: None,
+        ATTR_UNIT_IMPERIAL: None,
+    },
+}
+
+LOCAL_SENSOR_TYPES = {
+    "PressureTrend": {
+        ATTR_ATTRIBUTES: {"samples": "samples"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "pressure_trend",
+        ATTR_ICON: "mdi:gauge",
+        ATTR_LABEL: "Pressure Trend",
+        ATTR_UNIT_METRIC: f"{PRESSURE_MBAR}/{TIME_HOURS}",
+        ATTR_UNIT_IMPERIAL: f"{PRESSURE_INHG}/{TIME_HOURS}",
+    },
+    "TemperatureEstimate": {
+        ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "temperature_estimate",
+        ATTR_ICON: None,
+        ATTR_LABEL: "Temperature Estimate",
+        ATTR_UNIT_METRIC: TEMP_CELSIUS,
+        ATTR_UNIT_IMPERIAL: TEMP_FAHRENHEIT,
+    },
+    "TemperatureTrend": {
+        ATTR_ATTRIBUTES: {"samples": "samples"},
+        ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "temperature_trend",
+        ATTR_ICON: "mdi:thermometer-lines",
+        ATTR_LABEL: "Temperature Trend",
+        ATTR_UNIT_METRIC: f"{TEMP_CELSIUS}/{TIME_HOURS}",
+        ATTR_UNIT_IMPERIAL: f"{TEMP_FAHRENHEIT}/{TIME_HOURS}",
+    },
+}
+
 OPTIONAL_SENSORS = (
     "ApparentTemperature",
     "CloudCover",
@@ -178,10 +517,13 @@ OPTIONAL_SENSORS = (
     "Grass",
     "Mold",
     "Ozone",
+    "PressureTrend",
     "Ragweed",
     "RealFeelTemperatureShade",
     "RealFeelTemperatureShadeMax",
     "RealFeelTemperatureShadeMin",
+    "TemperatureEstimate",
+    "TemperatureTrend",
     "Tree",
     "WetBulbTemperature",
     "WindChillTemperature",
@@ -193,6 +535,7 @@ OPTIONAL_SENSORS = (
 SENSOR_TYPES = {
     "ApparentTemperature": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "apparent_temperature",
         ATTR_ICON: None,
         ATTR_LABEL: "Apparent Temperature",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -200,6 +543,7 @@ SENSOR_TYPES = {
     },
     "Ceiling": {
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "ceiling",
         ATTR_ICON: "mdi:weather-fog",
         ATTR_LABEL: "Cloud Ceiling",
         ATTR_UNIT_METRIC: LENGTH_METERS,
@@ -207,6 +551,7 @@ SENSOR_TYPES = {
     },
     "CloudCover": {
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "cloud_cover",
         ATTR_ICON: "mdi:weather-cloudy",
         ATTR_LABEL: "Cloud Cover",
         ATTR_UNIT_METRIC: UNIT_PERCENTAGE,
@@ -214,6 +559,7 @@ SENSOR_TYPES = {
     },
     "DewPoint": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "dew_point",
         ATTR_ICON: None,
         ATTR_LABEL: "Dew Point",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -221,6 +567,7 @@ SENSOR_TYPES = {
     },
     "RealFeelTemperature": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "real_feel_temperature",
         ATTR_ICON: None,
         ATTR_LABEL: "RealFeel Temperature",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -228,13 +575,16 @@ SENSOR_TYPES = {
     },
     "RealFeelTemperatureShade": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "real_feel_temperature_shade",
         ATTR_ICON: None,
         ATTR_LABEL: "RealFeel Temperature Shade",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
         ATTR_UNIT_IMPERIAL: TEMP_FAHRENHEIT,
     },
     "Precipitation": {
+        ATTR_ATTRIBUTES: {"type": "precipitation_type"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "precipitation",
         ATTR_ICON: "mdi:weather-rainy",
         ATTR_LABEL: "Precipitation",
         ATTR_UNIT_METRIC: LENGTH_MILIMETERS,
@@ -242,13 +592,16 @@ SENSOR_TYPES = {
     },
     "PressureTendency": {
         ATTR_DEVICE_CLASS: "accuweather__pressure_tendency",
+        ATTR_FIELD: "pressure_tendency",
         ATTR_ICON: "mdi:gauge",
         ATTR_LABEL: "Pressure Tendency",
         ATTR_UNIT_METRIC: None,
         ATTR_UNIT_IMPERIAL: None,
     },
     "UVIndex": {
+        ATTR_ATTRIBUTES: {"level": "uv_index_text"},
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "uv_index",
         ATTR_ICON: "mdi:weather-sunny",
         ATTR_LABEL: "UV Index",
         ATTR_UNIT_METRIC: UV_INDEX,
@@ -256,6 +609,7 @@ SENSOR_TYPES = {
     },
     "WetBulbTemperature": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "wet_bulb_temperature",
         ATTR_ICON: None,
         ATTR_LABEL: "Wet Bulb Temperature",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -263,6 +617,7 @@ SENSOR_TYPES = {
     },
     "WindChillTemperature": {
         ATTR_DEVICE_CLASS: DEVICE_CLASS_TEMPERATURE,
+        ATTR_FIELD: "wind_chill_temperature",
         ATTR_ICON: None,
         ATTR_LABEL: "Wind Chill Temperature",
         ATTR_UNIT_METRIC: TEMP_CELSIUS,
@@ -270,6 +625,7 @@ SENSOR_TYPES = {
     },
     "WindGust": {
         ATTR_DEVICE_CLASS: None,
+        ATTR_FIELD: "wind_gust",
         ATTR_ICON: "mdi:weather-windy",
         ATTR_LABEL: "Wind Gust",
         ATTR_UNIT_METRIC: SPEED_KILOMETERS_PER_HOUR,
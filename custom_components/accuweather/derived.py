@@ -0,0 +1,138 @@
+"""Values computed locally from the AccuWeather data."""
+from bisect import bisect_right
+from collections import deque
+from math import atan, isnan, log, sqrt
+from time import time
+from typing import Optional
+
+from .model import CurrentConditions, HourlyForecast
+
+
+def dew_point(temperature: float, humidity: float) -> float:
+    """Return the dew point in Celsius, Magnus formula."""
+    gamma = log(humidity / 100) + 17.62 * temperature / (243.12 + temperature)
+    return 243.12 * gamma / (17.62 - gamma)
+
+
+def wet_bulb_temperature(temperature: float, humidity: float) -> float:
+    """Return the wet bulb temperature in Celsius, Stull formula."""
+    return (
+        temperature * atan(0.151977 * sqrt(humidity + 8.313659))
+        + atan(temperature + humidity)
+        - atan(humidity - 1.676331)
+        + 0.00391838 * humidity**1.5 * atan(0.023101 * humidity)
+        - 4.686035
+    )
+
+
+def wind_chill_temperature(temperature: float, wind_speed: float) -> float:
+    """Return the wind chill temperature in Celsius, wind speed in km/h."""
+    # The formula is defined only for cold and windy conditions.
+    if temperature > 10 or wind_speed < 4.8:
+        return temperature
+    return (
+        13.12
+        + 0.6215 * temperature
+        - 11.37 * wind_speed**0.16
+        + 0.3965 * temperature * wind_speed**0.16
+    )
+
+
+def fill_derived(current: CurrentConditions):
+    """Compute the values missing in the current conditions."""
+    temperature = current.temperature
+    if temperature is None:
+        return
+    derived = {}
+    if current.relative_humidity:
+        derived["dew_point"] = dew_point(temperature, current.relative_humidity)
+        derived["wet_bulb_temperature"] = wet_bulb_temperature(
+            temperature, current.relative_humidity
+        )
+    if current.wind_speed is not None:
+        derived["wind_chill_temperature"] = wind_chill_temperature(
+            temperature, current.wind_speed
+        )
+    for field, value in derived.items():
+        if getattr(current, field) is None:
+            setattr(current, field, round(value, 1))
+
+
+def slope(samples, index: int) -> Optional[float]:
+    """Return the least squares slope per hour of the values at the index."""
+    points = [
+        (sample[0], sample[index]) for sample in samples if sample[index] is not None
+    ]
+    if len(points) < 2:
+        return None
+    mean_time = sum(point[0] for point in points) / len(points)
+    mean_value = sum(point[1] for point in points) / len(points)
+    variance = sum((point[0] - mean_time) ** 2 for point in points)
+    if not variance:
+        return None
+    covariance = sum(
+        (point[0] - mean_time) * (point[1] - mean_value) for point in points
+    )
+    return covariance / variance * 3600
+
+
+class LocalConditions:
+    """Trends and estimates of the current conditions between API polls.
+
+    The recent observations of a location are kept in a fixed-size ring buffer.
+    """
+
+    def __init__(self, samples: int):
+        """Initialize."""
+        # (timestamp, temperature, pressure)
+        self._samples = deque(maxlen=samples)
+        self._hourly = None
+
+    def update(
+        self,
+        current: CurrentConditions,
+        observed_at: float,
+        hourly: Optional[HourlyForecast],
+    ):
+        """Add the observation unless it is already in the buffer."""
+        self._hourly = hourly
+        if self._samples and self._samples[-1][0] >= observed_at:
+            return
+        self._samples.append((observed_at, current.temperature, current.pressure))
+
+    @property
+    def samples(self) -> int:
+        """Return the number of observations in the buffer."""
+        return len(self._samples)
+
+    @property
+    def temperature_trend(self) -> Optional[float]:
+        """Return the temperature change per hour."""
+        value = slope(self._samples, 1)
+        return round(value, 1) if value is not None else None
+
+    @property
+    def pressure_trend(self) -> Optional[float]:
+        """Return the pressure change per hour."""
+        value = slope(self._samples, 2)
+        return round(value, 2) if value is not None else None
+
+    @property
+    def temperature_estimate(self) -> Optional[float]:
+        """Return the last temperature moved linearly toward the hourly forecast."""
+        if not self._samples:
+            return None
+        observed_at, temperature, _ = self._samples[-1]
+        hourly = self._hourly
+        if temperature is None or hourly is None:
+            return temperature
+        now = time()
+        index = bisect_right(hourly.epoch_date, now)
+        if index == len(hourly):
+            return temperature
+        target_at = hourly.epoch_date[index]
+        target = hourly.temperature[index]
+        if isnan(target) or target_at <= observed_at:
+            return temperature
+        fraction = min(max((now - observed_at) / (target_at - observed_at), 0), 1)
+        return round(temperature + (target - temperature) * fraction, 1)
@@ -0,0 +1,90 @@
+"""Base entity for the AccuWeather service."""
+from time import monotonic
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_registry import (
+    async_entries_for_config_entry,
+    async_get_registry,
+)
+
+from .const import ALL_FIELDS
+
+
+async def async_get_disabled_unique_ids(hass, config_entry) -> set:
+    """Return unique_ids of the entities disabled in the entity registry."""
+    registry = await async_get_registry(hass)
+    return {
+        entry.unique_id
+        for entry in async_entries_for_config_entry(registry, config_entry.entry_id)
+        if entry.disabled
+    }
+
+
+def sensor_unique_id(location_key, kind, forecast_day=None):
+    """Return a unique_id of the sensor."""
+    if forecast_day is not None:
+        return f"{location_key}-{kind}-{forecast_day}".lower()
+    return f"{location_key}-{kind}".lower()
+
+
+class AccuWeatherCoordinatorEntity(Entity):
+    """Define an AccuWeather entity using the coordinator data."""
+
+    def __init__(self, coordinator):
+        """Initialize."""
+        self.coordinator = coordinator
+        self._last_written = None
+
+    @property
+    def _data_paths(self):
+        """Return the data paths the state of the entity depends on."""
+        return [ALL_FIELDS]
+
+    @property
+    def should_poll(self):
+        """Return the polling requirement of the entity."""
+        return False
+
+    @property
+    def available(self):
+        """Return True if entity is available."""
+        return self.coordinator.data_available
+
+    def _state_to_write(self):
+        """Return the availability, state and attributes the entity would write."""
+        attrs = self.device_state_attributes
+        return (
+            self.available,
+            self.state,
+            self.state_attributes,
+            dict(attrs) if attrs is not None else None,
+        )
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write the state only if it changed since the last write."""
+        metrics = self.coordinator.metrics
+        start = monotonic()
+        state = self._state_to_write()
+        if state == self._last_written:
+            metrics.state_writes["skipped"] += 1
+        else:
+            self._last_written = state
+            metrics.state_writes["emitted"] += 1
+            self.async_write_ha_state()
+        metrics.render_time += monotonic() - start
+
+    async def async_added_to_hass(self):
+        """Connect to dispatcher listening for entity data notifications."""
+        # The state is written when the entity is added.
+        self._last_written = self._state_to_write()
+        self.async_on_remove(
+            self.coordinator.async_add_field_listener(
+                self._data_paths, self._handle_coordinator_update
+            )
+        )
+
+    async def async_update(self):
+        """Update AccuWeather entity."""
+        await self.coordinator.async_request_refresh()
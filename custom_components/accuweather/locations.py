@@ -0,0 +1,123 @@
+"""Persistent cache of AccuWeather location keys."""
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from accuweather import ApiError, InvalidApiKeyError, RequestsExceededError
+from aiohttp import ClientError
+from async_timeout import timeout
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.helpers.storage import Store
+
+from .api import AccuWeatherClient, validate_api_key
+from .const import (
+    ATTR_LOCATION_KEY,
+    DOMAIN,
+    LOCATION_PRECISION,
+    LOCATIONS,
+    LOCATIONS_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SAVE_DELAY = 10
+
+
+async def async_get_location_cache(hass) -> "LocationCache":
+    """Return the location cache shared by the config flow and the config entries."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if LOCATIONS not in data:
+        data[LOCATIONS] = LocationCache(hass)
+    await data[LOCATIONS].async_load()
+    return data[LOCATIONS]
+
+
+class LocationCache:
+    """Map geopositions rounded to LOCATION_PRECISION to location keys.
+
+    Resolving a geoposition costs a request, the location key of a place doesn't
+    change so it is resolved only once.
+    """
+
+    def __init__(self, hass):
+        """Initialize."""
+        self._store = Store(hass, LOCATIONS_STORAGE_VERSION, f"{DOMAIN}.{LOCATIONS}")
+        self._locations = None
+        self._lock = asyncio.Lock()
+
+    async def async_load(self):
+        """Load the cached location keys from the disk once."""
+        async with self._lock:
+            if self._locations is None:
+                self._locations = await self._store.async_load() or {}
+                _LOGGER.debug("Loaded %s cached locations", len(self._locations))
+
+    @staticmethod
+    def _key(latitude: float, longitude: float) -> str:
+        """Return the cache key of the geoposition."""
+        return (
+            f"{round(float(latitude), LOCATION_PRECISION)},"
+            f"{round(float(longitude), LOCATION_PRECISION)}"
+        )
+
+    def get(self, latitude: float, longitude: float) -> Optional[str]:
+        """Return the cached location key of the geoposition."""
+        return self._locations.get(self._key(latitude, longitude))
+
+    def set(self, latitude: float, longitude: float, location_key: str):
+        """Cache the location key of the geoposition."""
+        key = self._key(latitude, longitude)
+        if self._locations.get(key) == location_key:
+            return
+        self._locations[key] = location_key
+        self._store.async_delay_save(lambda: self._locations, SAVE_DELAY)
+
+    async def async_get_location_key(
+        self, api_key: str, session, latitude: float, longitude: float
+    ) -> str:
+        """Return the location key of the geoposition, resolve it if not cached."""
+        location_key = self.get(latitude, longitude)
+        if location_key is not None:
+            # No request checks the API key, at least its format is.
+            validate_api_key(api_key)
+            _LOGGER.debug("Using cached location_key: %s", location_key)
+            return location_key
+
+        accuweather = AccuWeatherClient(
+            api_key, session, latitude=latitude, longitude=longitude
+        )
+        with timeout(10):
+            await accuweather.async_get_location()
+        self.set(latitude, longitude, accuweather.location_key)
+        return accuweather.location_key
+
+    async def async_import(
+        self, locations: Iterable[dict], api_key: Optional[str] = None, session=None
+    ):
+        """Import location keys in bulk.
+
+        Locations without a location key are resolved with the API key, once.
+        """
+        for location in locations:
+            latitude = location[CONF_LATITUDE]
+            longitude = location[CONF_LONGITUDE]
+            if location.get(ATTR_LOCATION_KEY):
+                self.set(latitude, longitude, location[ATTR_LOCATION_KEY])
+            elif api_key is None:
+                _LOGGER.warning(
+                    "Location key of %s, %s is missing and no API key is given",
+                    latitude,
+                    longitude,
+                )
+            else:
+                try:
+                    await self.async_get_location_key(
+                        api_key, session, latitude, longitude
+                    )
+                except (InvalidApiKeyError, RequestsExceededError) as error:
+                    _LOGGER.error("Import of locations stopped: %s", error)
+                    return
+                except (ApiError, ClientError, asyncio.TimeoutError) as error:
+                    _LOGGER.warning(
+                        "Cannot resolve location %s, %s: %s", latitude, longitude, error
+                    )
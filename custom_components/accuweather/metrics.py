@@ -0,0 +1,199 @@
+"""Instrumentation of the AccuWeather integration."""
+from bisect import bisect_left
+from collections import Counter
+
+from .const import (
+    ENDPOINT_ALERTS,
+    ENDPOINT_CURRENT_CONDITIONS,
+    ENDPOINT_FORECAST,
+    ENDPOINT_HISTORICAL_CONDITIONS,
+    ENDPOINT_HOURLY_FORECAST,
+    ENDPOINT_MINUTECAST,
+)
+
+# Upper bounds of the latency histogram buckets in seconds.
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """Histogram of the observed values."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple):
+        """Initialize."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value: float):
+        """Add an observed value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self):
+        """Return the mean of the observed values."""
+        return self.sum / self.count if self.count else None
+
+    def as_dict(self) -> dict:
+        """Return the number of values in each bucket."""
+        labels = [f"le_{bucket}" for bucket in self.buckets] + ["inf"]
+        return dict(zip(labels, self.counts))
+
+
+class AccuWeatherMetrics:
+    """Metrics of the fetch path and the entity render path."""
+
+    def __init__(self, client):
+        """Initialize."""
+        self._client = client
+        self.latency = {
+            ENDPOINT_ALERTS: Histogram(LATENCY_BUCKETS),
+            ENDPOINT_CURRENT_CONDITIONS: Histogram(LATENCY_BUCKETS),
+            ENDPOINT_FORECAST: Histogram(LATENCY_BUCKETS),
+            ENDPOINT_HISTORICAL_CONDITIONS: Histogram(LATENCY_BUCKETS),
+            ENDPOINT_HOURLY_FORECAST: Histogram(LATENCY_BUCKETS),
+            ENDPOINT_MINUTECAST: Histogram(LATENCY_BUCKETS),
+        }
+        self.errors_by_type = Counter()
+        self.render_time = 0
+        self.state_writes = Counter(emitted=0, skipped=0)
+        # Requested refreshes which joined the refresh in flight or came too soon
+        # after the last one.
+        self.coalesced = Counter(joined=0, spaced=0)
+        # Entity callbacks made and avoided by the per-field listeners.
+        self.notifications = Counter(notified=0, filtered=0)
+
+    def record_error(self, error: Exception):
+        """Count a fetch error by its type."""
+        self.errors_by_type[type(error).__name__] += 1
+
+    @property
+    def bytes_received(self):
+        """Return the number of bytes received from the API."""
+        return self._client.bytes_received
+
+    @property
+    def requests_remaining(self):
+        """Return the number of remaining requests."""
+        return self._client.requests_remaining
+
+    @property
+    def errors(self):
+        """Return the number of fetch errors."""
+        return sum(self.errors_by_type.values())
+
+    @property
+    def error_types(self):
+        """Return the number of fetch errors by the error type."""
+        return dict(self.errors_by_type)
+
+    @property
+    def latency_current_conditions(self):
+        """Return the mean latency of current conditions requests in ms."""
+        return self._mean_ms(self.latency[ENDPOINT_CURRENT_CONDITIONS])
+
+    @property
+    def latency_current_conditions_histogram(self):
+        """Return the latency histogram of current conditions requests."""
+        return self.latency[ENDPOINT_CURRENT_CONDITIONS].as_dict()
+
+    @property
+    def latency_forecast(self):
+        """Return the mean latency of forecast requests in ms."""
+        return self._mean_ms(self.latency[ENDPOINT_FORECAST])
+
+    @property
+    def latency_forecast_histogram(self):
+        """Return the latency histogram of forecast requests."""
+        return self.latency[ENDPOINT_FORECAST].as_dict()
+
+    @property
+    def latency_hourly_forecast(self):
+        """Return the mean latency of hourly forecast requests in ms."""
+        return self._mean_ms(self.latency[ENDPOINT_HOURLY_FORECAST])
+
+    @property
+    def latency_hourly_forecast_histogram(self):
+        """Return the latency histogram of hourly forecast requests."""
+        return self.latency[ENDPOINT_HOURLY_FORECAST].as_dict()
+
+    @property
+    def latency_historical_conditions(self):
+        """Return the mean latency of historical conditions requests in ms."""
+        return self._mean_ms(self.latency[ENDPOINT_HISTORICAL_CONDITIONS])
+
+    @property
+    def latency_historical_conditions_histogram(self):
+        """Return the latency histogram of historical conditions requests."""
+        return self.latency[ENDPOINT_HISTORICAL_CONDITIONS].as_dict()
+
+    @property
+    def latency_alerts(self):
+        """Return the mean latency of alerts requests in ms."""
+        return self._mean_ms(self.latency[ENDPOINT_ALERTS])
+
+    @property
+    def latency_alerts_histogram(self):
+        """Return the latency histogram of alerts requests."""
+        return self.latency[ENDPOINT_ALERTS].as_dict()
+
+    @property
+    def latency_minutecast(self):
+        """Return the mean latency of MinuteCast requests in ms."""
+        return self._mean_ms(self.latency[ENDPOINT_MINUTECAST])
+
+    @property
+    def latency_minutecast_histogram(self):
+        """Return the latency histogram of MinuteCast requests."""
+        return self.latency[ENDPOINT_MINUTECAST].as_dict()
+
+    @property
+    def state_writes_emitted(self):
+        """Return the number of emitted state writes."""
+        return self.state_writes["emitted"]
+
+    @property
+    def state_writes_skipped(self):
+        """Return the number of skipped state writes."""
+        return self.state_writes["skipped"]
+
+    @property
+    def coalesced_refreshes(self):
+        """Return the number of coalesced refresh requests."""
+        return sum(self.coalesced.values())
+
+    @property
+    def coalesced_joined(self):
+        """Return the number of refresh requests joined to the refresh in flight."""
+        return self.coalesced["joined"]
+
+    @property
+    def coalesced_spaced(self):
+        """Return the number of refresh requests dropped as too frequent."""
+        return self.coalesced["spaced"]
+
+    @property
+    def notifications_notified(self):
+        """Return the number of entity callbacks made."""
+        return self.notifications["notified"]
+
+    @property
+    def notifications_filtered(self):
+        """Return the number of entity callbacks avoided as their data didn't change."""
+        return self.notifications["filtered"]
+
+    @property
+    def render_time_per_write(self):
+        """Return the mean time of building the entity state in ms."""
+        writes = sum(self.state_writes.values())
+        return round(self.render_time / writes * 1000, 3) if writes else None
+
+    @staticmethod
+    def _mean_ms(histogram: Histogram):
+        """Return the mean of the histogram in ms."""
+        mean = histogram.mean
+        return round(mean * 1000) if mean is not None else None
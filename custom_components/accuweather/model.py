@@ -0,0 +1,389 @@
+"""Parsed AccuWeather data."""
+from array import array
+from bisect import bisect_left
+from itertools import filterfalse, zip_longest
+from math import fsum, isnan, nan
+from typing import Iterable, List, Optional
+
+from homeassistant.util.dt import utcnow
+
+# Placeholder in field paths for the key of the configured unit system.
+UNIT = object()
+
+
+def _resolve(data: dict, path: tuple, unit_system: str):
+    """Return the value under the path or None if the path doesn't exist."""
+    for key in path:
+        try:
+            data = data[unit_system if key is UNIT else key]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return data
+
+
+def _ceiling(data: dict, unit_system: str):
+    """Return the rounded cloud ceiling."""
+    return round(data["Ceiling"][unit_system]["Value"])
+
+
+def _pressure_tendency(data: dict, unit_system: str):
+    """Return the pressure tendency usable as a state."""
+    return data["PressureTendency"]["LocalizedText"].lower()
+
+
+def _precipitation(data: dict, unit_system: str):
+    """Return sum of the precipitation."""
+    return round(
+        data["RainDay"]["Value"]
+        + data["RainNight"]["Value"]
+        + data["SnowDay"]["Value"]
+        + data["SnowNight"]["Value"]
+        + data["IceDay"]["Value"]
+        + data["IceNight"]["Value"],
+        1,
+    )
+
+
+def _precipitation_probability(data: dict, unit_system: str):
+    """Return mean of the day and night precipitation probability."""
+    return round(
+        (data["PrecipitationProbabilityDay"] + data["PrecipitationProbabilityNight"])
+        / 2
+    )
+
+
+def _precipitation_summary(data: dict) -> Optional[dict]:
+    """Return the first MinuteCast summary with precipitation."""
+    return next((summary for summary in data["Summaries"] if summary.get("Type")), None)
+
+
+def _minutecast_type(data: dict, unit_system: str):
+    """Return the type of the nearest precipitation."""
+    return _precipitation_summary(data)["Type"].lower()
+
+
+def _minutecast_start(data: dict, unit_system: str):
+    """Return the minute the nearest precipitation starts."""
+    return _precipitation_summary(data)["StartMinute"]
+
+
+def _minutecast_end(data: dict, unit_system: str):
+    """Return the minute the nearest precipitation ends."""
+    return _precipitation_summary(data)["EndMinute"]
+
+
+class Snapshot:
+    """Flat view of an API response with the unit system already resolved.
+
+    FIELDS maps each field to its path in the API response or to a function
+    computing it.
+    """
+
+    __slots__ = ()
+
+    FIELDS = {}
+
+    @classmethod
+    def from_api(cls, data: dict, unit_system: str, fields: Optional[Iterable] = None):
+        """Parse an API response, optionally only the given fields."""
+        snapshot = cls.__new__(cls)
+        for field, path in cls.FIELDS.items():
+            if fields is not None and field not in fields:
+                value = None
+            elif callable(path):
+                try:
+                    value = path(data, unit_system)
+                except (KeyError, TypeError):
+                    value = None
+            else:
+                value = _resolve(data, path, unit_system)
+            setattr(snapshot, field, value)
+        return snapshot
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Restore a snapshot stored with as_dict."""
+        snapshot = cls.__new__(cls)
+        for field in cls.FIELDS:
+            setattr(snapshot, field, data.get(field))
+        return snapshot
+
+    def changed_fields(self, other: Optional["Snapshot"]) -> list:
+        """Return the fields with a different value in the other snapshot."""
+        if other is None:
+            return list(self.FIELDS)
+        return [
+            field
+            for field in self.FIELDS
+            if getattr(self, field) != getattr(other, field)
+        ]
+
+    def as_dict(self) -> dict:
+        """Return the fields which have a value as a dict."""
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        return data
+
+
+class CurrentConditions(Snapshot):
+    """Current conditions."""
+
+    FIELDS = {
+        "apparent_temperature": ("ApparentTemperature", UNIT, "Value"),
+        "ceiling": _ceiling,
+        "cloud_cover": ("CloudCover",),
+        "dew_point": ("DewPoint", UNIT, "Value"),
+        "epoch_time": ("EpochTime",),
+        "precipitation": ("PrecipitationSummary", "Precipitation", UNIT, "Value"),
+        "precipitation_type": ("PrecipitationType",),
+        "pressure": ("Pressure", UNIT, "Value"),
+        "pressure_tendency": _pressure_tendency,
+        "real_feel_temperature": ("RealFeelTemperature", UNIT, "Value"),
+        "real_feel_temperature_shade": ("RealFeelTemperatureShade", UNIT, "Value"),
+        "relative_humidity": ("RelativeHumidity",),
+        "temperature": ("Temperature", UNIT, "Value"),
+        "uv_index": ("UVIndex",),
+        "uv_index_text": ("UVIndexText",),
+        "visibility": ("Visibility", UNIT, "Value"),
+        "weather_icon": ("WeatherIcon",),
+        "wet_bulb_temperature": ("WetBulbTemperature", UNIT, "Value"),
+        "wind_bearing": ("Wind", "Direction", "Degrees"),
+        "wind_chill_temperature": ("WindChillTemperature", UNIT, "Value"),
+        "wind_gust": ("WindGust", "Speed", UNIT, "Value"),
+        "wind_speed": ("Wind", "Speed", UNIT, "Value"),
+    }
+
+    __slots__ = tuple(FIELDS)
+
+
+class ForecastDay(Snapshot):
+    """Forecast for one day, fetched in metric units."""
+
+    FIELDS = {
+        "cloud_cover_day": ("CloudCoverDay",),
+        "cloud_cover_night": ("CloudCoverNight",),
+        "epoch_date": ("EpochDate",),
+        "grass": ("Grass", "Value"),
+        "grass_level": ("Grass", "Category"),
+        "hours_of_sun": ("HoursOfSun",),
+        "icon_day": ("IconDay",),
+        "mold": ("Mold", "Value"),
+        "mold_level": ("Mold", "Category"),
+        "ozone": ("Ozone", "Value"),
+        "ozone_level": ("Ozone", "Category"),
+        "precipitation": _precipitation,
+        "precipitation_probability": _precipitation_probability,
+        "ragweed": ("Ragweed", "Value"),
+        "ragweed_level": ("Ragweed", "Category"),
+        "real_feel_temperature_max": ("RealFeelTemperatureMax", "Value"),
+        "real_feel_temperature_min": ("RealFeelTemperatureMin", "Value"),
+        "real_feel_temperature_shade_max": ("RealFeelTemperatureShadeMax", "Value"),
+        "real_feel_temperature_shade_min": ("RealFeelTemperatureShadeMin", "Value"),
+        "temperature_max": ("TemperatureMax", "Value"),
+        "temperature_min": ("TemperatureMin", "Value"),
+        "thunderstorm_probability_day": ("ThunderstormProbabilityDay",),
+        "thunderstorm_probability_night": ("ThunderstormProbabilityNight",),
+        "tree": ("Tree", "Value"),
+        "tree_level": ("Tree", "Category"),
+        "uv_index": ("UVIndex", "Value"),
+        "uv_index_level": ("UVIndex", "Category"),
+        "wind_bearing_day": ("WindDay", "Direction", "Degrees"),
+        "wind_gust_day": ("WindGustDay", "Speed", "Value"),
+        "wind_gust_day_direction": ("WindGustDay", "Direction", "English"),
+        "wind_gust_night": ("WindGustNight", "Speed", "Value"),
+        "wind_gust_night_direction": ("WindGustNight", "Direction", "English"),
+        "wind_speed_day": ("WindDay", "Speed", "Value"),
+    }
+
+    __slots__ = tuple(FIELDS)
+
+
+class WeatherAlert(Snapshot):
+    """Severe weather alert."""
+
+    FIELDS = {
+        "alert_id": ("AlertID",),
+        "category": ("Category",),
+        "description": ("Description", "Localized"),
+        "end": ("Area", 0, "EpochEndTime"),
+        "level": ("Level",),
+        "priority": ("Priority",),
+        "source": ("Source",),
+        "start": ("Area", 0, "EpochStartTime"),
+        "summary": ("Area", 0, "Summary"),
+    }
+
+    __slots__ = tuple(FIELDS)
+
+
+class MinuteCast(Snapshot):
+    """Minute by minute precipitation forecast of the next two hours."""
+
+    FIELDS = {
+        "phrase": ("Summary", "Phrase"),
+        "precipitation_end": _minutecast_end,
+        "precipitation_start": _minutecast_start,
+        "precipitation_type": _minutecast_type,
+    }
+
+    __slots__ = tuple(FIELDS)
+
+
+class HourlyForecast:
+    """Hourly forecast, fetched in metric units.
+
+    The forecast is stored column-wise, one compact array per field. Missing values
+    are NaN in float columns and 0 in integer columns.
+    """
+
+    # Field: (array typecode, path in the API response)
+    COLUMNS = {
+        "epoch_date": ("q", ("EpochDateTime",)),
+        "precipitation": ("d", ("TotalLiquid", "Value")),
+        "precipitation_probability": ("d", ("PrecipitationProbability",)),
+        "temperature": ("d", ("Temperature", "Value")),
+        "weather_icon": ("B", ("WeatherIcon",)),
+        "wind_bearing": ("d", ("Wind", "Direction", "Degrees")),
+        "wind_gust": ("d", ("WindGust", "Speed", "Value")),
+        "wind_speed": ("d", ("Wind", "Speed", "Value")),
+    }
+
+    __slots__ = tuple(COLUMNS)
+
+    def __init__(self, columns: dict):
+        """Initialize."""
+        for field, (typecode, _) in self.COLUMNS.items():
+            missing = nan if typecode == "d" else 0
+            setattr(
+                self,
+                field,
+                array(
+                    typecode,
+                    (missing if value is None else value for value in columns[field]),
+                ),
+            )
+
+    def __len__(self):
+        """Return the number of hours."""
+        return len(self.epoch_date)
+
+    @classmethod
+    def from_api(cls, data: list):
+        """Parse an API response."""
+        return cls(
+            {
+                field: [_resolve(hour, path, None) for hour in data]
+                for field, (_, path) in cls.COLUMNS.items()
+            }
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Restore a forecast stored with as_dict."""
+        return cls(data)
+
+    def as_dict(self) -> dict:
+        """Return the columns as lists with None for the missing values."""
+        return {field: self._values(field) for field in self.COLUMNS}
+
+    def rows(self):
+        """Return the forecast hour by hour."""
+        columns = [self._values(field) for field in self.COLUMNS]
+        return [dict(zip(self.COLUMNS, row)) for row in zip(*columns)]
+
+    def _values(self, field: str) -> list:
+        """Return the column as a list with None for the missing values."""
+        if self.COLUMNS[field][0] == "d":
+            return [None if isnan(value) else value for value in getattr(self, field)]
+        return [value or None for value in getattr(self, field)]
+
+    def _column(self, field: str, hours: Optional[int]):
+        """Return the present values of the field in the next hours."""
+        # The hours which passed since the forecast was fetched are skipped.
+        start = bisect_left(self.epoch_date, utcnow().timestamp())
+        end = start + hours if hours is not None else None
+        return filterfalse(isnan, getattr(self, field)[start:end])
+
+    def max_over(self, field: str, hours: Optional[int] = None):
+        """Return the maximum of the field in the next hours."""
+        return max(self._column(field, hours), default=None)
+
+    def min_over(self, field: str, hours: Optional[int] = None):
+        """Return the minimum of the field in the next hours."""
+        return min(self._column(field, hours), default=None)
+
+    def sum_over(self, field: str, hours: Optional[int] = None):
+        """Return the sum of the field in the next hours."""
+        return round(fsum(self._column(field, hours)), 1)
+
+
+class AccuWeatherData:
+    """Data of the coordinator."""
+
+    __slots__ = ("current", "forecast", "hourly")
+
+    def __init__(
+        self,
+        current: CurrentConditions,
+        forecast: List[ForecastDay],
+        hourly: Optional[HourlyForecast] = None,
+    ):
+        """Initialize."""
+        self.current = current
+        self.forecast = forecast
+        self.hourly = hourly
+
+    def changed_paths(self, previous: "AccuWeatherData") -> set:
+        """Return the paths of the fields which changed since the previous data.
+
+        The paths are "current.<field>", "forecast[<day>].<field>" and "hourly".
+        Sections which weren't refetched are the same objects and are skipped.
+        """
+        paths = set()
+        if self.current is not previous.current:
+            paths.update(
+                f"current.{field}"
+                for field in self.current.changed_fields(previous.current)
+            )
+        if self.forecast is not previous.forecast:
+            for day, (new, old) in enumerate(
+                zip_longest(self.forecast, previous.forecast)
+            ):
+                if new is None:
+                    continue
+                paths.update(
+                    f"forecast[{day}].{field}" for field in new.changed_fields(old)
+                )
+        if self.hourly is not previous.hourly:
+            paths.add("hourly")
+        return paths
+
+
+class NowcastData:
+    """Data of the nowcast coordinator, None for sections not fetched yet."""
+
+    __slots__ = ("alerts", "minutecast")
+
+    def __init__(
+        self,
+        alerts: Optional[List[WeatherAlert]] = None,
+        minutecast: Optional[MinuteCast] = None,
+    ):
+        """Initialize."""
+        self.alerts = alerts
+        self.minutecast = (
+            minutecast if minutecast is not None else MinuteCast.from_dict({})
+        )
+
+    @property
+    def alert_count(self) -> Optional[int]:
+        """Return the number of the alerts in effect."""
+        return len(self.alerts) if self.alerts is not None else None
+
+    @property
+    def alert_details(self) -> list:
+        """Return the alerts in effect as dicts."""
+        return [alert.as_dict() for alert in self.alerts or ()]
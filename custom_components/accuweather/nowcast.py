@@ -0,0 +1,260 @@
+"""Severe weather alerts and MinuteCast nowcast of the AccuWeather service."""
+import asyncio
+import logging
+from datetime import timedelta
+from time import monotonic
+
+from accuweather import RequestsExceededError
+from async_timeout import timeout
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util.dt import utc_from_timestamp, utcnow
+
+from .api import UPDATE_ERRORS
+from .const import (
+    ATTR_UNIT_METRIC,
+    DOMAIN,
+    ENDPOINT_ALERTS,
+    ENDPOINT_MINUTECAST,
+    NOWCAST_BURST_UPDATES_PER_DAY,
+    NOWCAST_FAST_INTERVAL,
+    NOWCAST_HOURS,
+    NOWCAST_PRECIPITATION_PROBABILITY,
+    NOWCAST_SLOW_INTERVAL,
+)
+from .model import MinuteCast, NowcastData, WeatherAlert
+
+_LOGGER = logging.getLogger(__name__)
+
+# Cache section of the fast updates of the day.
+BURSTS_SECTION = "nowcast_bursts"
+
+
+class AccuWeatherNowcastCoordinator(DataUpdateCoordinator):
+    """Poll the alerts and the MinuteCast of a location.
+
+    The nowcast is polled every NOWCAST_SLOW_INTERVAL, and in bursts every
+    NOWCAST_FAST_INTERVAL while precipitation is reported or expected soon. A burst
+    starts as soon as an update of the current conditions brings precipitation. The
+    requests, the budget of the API key and the cache are shared with the location
+    coordinator, bursts are skipped when its quota runs low or when the
+    NOWCAST_BURST_UPDATES_PER_DAY fast updates reserved for the UTC day are used.
+    """
+
+    def __init__(self, hass, coordinator, latitude: float, longitude: float):
+        """Initialize."""
+        self.coordinator = coordinator
+        self.endpoints = coordinator.nowcast_endpoints
+        self.latitude = latitude
+        self.longitude = longitude
+        self.bursting = False
+        self.next_update = utcnow() + NOWCAST_SLOW_INTERVAL
+        self._restore_from_cache = True
+        # Fast updates of the UTC day, also from before a restart.
+        bursts = coordinator.cache.get(BURSTS_SECTION)
+        self._burst_updates = bursts["data"] if bursts is not None else 0
+        self._remove_coordinator_listener = coordinator.async_add_listener(
+            self._async_coordinator_updated
+        )
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} nowcast",
+            update_interval=NOWCAST_SLOW_INTERVAL,
+        )
+        self.data = NowcastData()
+
+    @callback
+    def async_stop(self):
+        """Stop following the updates of the location coordinator."""
+        self._remove_coordinator_listener()
+
+    def precipitation_near(self, nowcast: NowcastData) -> bool:
+        """Return True if precipitation is reported or expected in the next hours."""
+        if nowcast.minutecast.precipitation_type is not None:
+            return True
+        data = self.coordinator.data
+        if data is None:
+            return False
+        if data.current.precipitation_type is not None:
+            return True
+        if data.hourly is not None:
+            probability = data.hourly.max_over(
+                "precipitation_probability", NOWCAST_HOURS
+            )
+        elif data.forecast:
+            probability = data.forecast[0].precipitation_probability
+        else:
+            probability = None
+        return (
+            probability is not None and probability >= NOWCAST_PRECIPITATION_PROBABILITY
+        )
+
+    def _burst(self, nowcast: NowcastData) -> bool:
+        """Return True if the nowcast should be polled fast."""
+        budget = self.coordinator.budget
+        if (
+            budget.exhausted
+            or self._burst_updates_today() >= NOWCAST_BURST_UPDATES_PER_DAY
+            or not self.precipitation_near(nowcast)
+        ):
+            return False
+        # Bursts use the requests left over, not when the location runs low on them.
+        scheduled = self.coordinator.scheduler.next_interval(budget.requests_remaining)
+        return scheduled <= NOWCAST_SLOW_INTERVAL
+
+    def _burst_updates_today(self) -> int:
+        """Return the number of fast updates of the UTC day."""
+        if self.coordinator.cache.get(BURSTS_SECTION) is None:
+            self._burst_updates = 0
+        return self._burst_updates
+
+    def _count_burst_update(self):
+        """Count a fast update, the count expires at the end of the UTC day."""
+        now = utcnow()
+        end_of_day = (now + timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self._burst_updates = self._burst_updates_today() + 1
+        self.coordinator.cache.set(
+            BURSTS_SECTION, self._burst_updates, None, end_of_day - now
+        )
+
+    def _set_update_interval(self, update_interval: timedelta):
+        """Set the time to the next update."""
+        self.update_interval = update_interval
+        self.next_update = utcnow() + update_interval
+
+    @callback
+    def _async_coordinator_updated(self):
+        """Start a burst when the current conditions bring precipitation."""
+        if self.bursting or not self._listeners or not self._burst(self.data):
+            return
+        _LOGGER.debug(
+            "Precipitation near %s, polling nowcast", self.coordinator.location_key
+        )
+        self.bursting = True
+        self.hass.async_create_task(self.async_refresh())
+
+    async def _async_update_alerts(self):
+        """Fetch severe weather alerts."""
+        start = monotonic()
+        with timeout(10):
+            data = await self.coordinator.accuweather.async_get_alerts()
+        self.coordinator.metrics.latency[ENDPOINT_ALERTS].observe(monotonic() - start)
+        return [WeatherAlert.from_api(alert, ATTR_UNIT_METRIC) for alert in data]
+
+    async def _async_update_minutecast(self):
+        """Fetch MinuteCast."""
+        start = monotonic()
+        with timeout(10):
+            data = await self.coordinator.accuweather.async_get_minutecast(
+                self.latitude, self.longitude
+            )
+        self.coordinator.metrics.latency[ENDPOINT_MINUTECAST].observe(
+            monotonic() - start
+        )
+        return MinuteCast.from_api(data, ATTR_UNIT_METRIC)
+
+    def _restore_cached_data(self, nowcast: NowcastData) -> dict:
+        """Restore the cached sections which are still fresh, return their entries."""
+        restored = {}
+        for endpoint in self.endpoints:
+            entry = self.coordinator.cache.get(endpoint)
+            if entry is None:
+                continue
+            restored[endpoint] = entry
+            if endpoint == ENDPOINT_ALERTS:
+                nowcast.alerts = [
+                    WeatherAlert.from_dict(alert) for alert in entry["data"]
+                ]
+            else:
+                nowcast.minutecast = MinuteCast.from_dict(entry["data"])
+        return restored
+
+    def _cache_section(self, nowcast: NowcastData, section: str):
+        """Cache the fetched section until the next update."""
+        if section == ENDPOINT_ALERTS:
+            data = nowcast.alert_details
+        else:
+            data = nowcast.minutecast.as_dict()
+        self.coordinator.cache.set(
+            section,
+            data,
+            self.coordinator.accuweather.response_meta.get(section),
+            self.update_interval,
+        )
+
+    async def _async_update_data(self):
+        """Update data via library."""
+        nowcast = NowcastData(self.data.alerts, self.data.minutecast)
+        restored = {}
+        if self._restore_from_cache:
+            # A restart within the update interval doesn't spend requests.
+            self._restore_from_cache = False
+            restored = self._restore_cached_data(nowcast)
+            if len(restored) == len(self.endpoints):
+                valid_until = min(entry["valid_until"] for entry in restored.values())
+                self._set_update_interval(utc_from_timestamp(valid_until) - utcnow())
+                _LOGGER.debug(
+                    "Using cached nowcast, next update in %s", self.update_interval
+                )
+                return nowcast
+
+        budget = self.coordinator.budget
+        if budget.exhausted:
+            self.bursting = False
+            self._set_update_interval(budget.exhausted_until - utcnow())
+            raise UpdateFailed("The allowed number of requests has been exceeded")
+
+        stages = {}
+        if ENDPOINT_ALERTS in self.endpoints and ENDPOINT_ALERTS not in restored:
+            stages[ENDPOINT_ALERTS] = self._async_update_alerts
+        if (
+            ENDPOINT_MINUTECAST in self.endpoints
+            and ENDPOINT_MINUTECAST not in restored
+        ):
+            stages[ENDPOINT_MINUTECAST] = self._async_update_minutecast
+
+        if self.bursting and stages:
+            self._count_burst_update()
+        async with budget:
+            results = await asyncio.gather(
+                *[stage() for stage in stages.values()], return_exceptions=True
+            )
+        fetched = []
+        errors = []
+        for section, result in zip(stages, results):
+            if isinstance(result, RequestsExceededError):
+                budget.set_exhausted()
+            if isinstance(result, Exception):
+                self.coordinator.metrics.record_error(result)
+            if isinstance(result, UPDATE_ERRORS):
+                _LOGGER.debug("Error fetching %s: %s", section, repr(result))
+                errors.append(result)
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                fetched.append(section)
+                if section == ENDPOINT_ALERTS:
+                    nowcast.alerts = result
+                else:
+                    nowcast.minutecast = result
+        if fetched:
+            budget.requests_remaining = self.coordinator.accuweather.requests_remaining
+
+        self.bursting = self._burst(nowcast)
+        if budget.exhausted:
+            self._set_update_interval(budget.exhausted_until - utcnow())
+        elif self.bursting:
+            self._set_update_interval(NOWCAST_FAST_INTERVAL)
+        else:
+            self._set_update_interval(NOWCAST_SLOW_INTERVAL)
+        _LOGGER.debug("Next nowcast update in %s", self.update_interval)
+        for section in fetched:
+            self._cache_section(nowcast, section)
+
+        if errors and len(errors) == len(stages):
+            raise UpdateFailed(errors[0])
+        return nowcast
@@ -0,0 +1,179 @@
+"""Caching proxy of the AccuWeather API shared by Home Assistant instances.
+
+Instances configured with the same location ask the proxy instead of the API, the
+proxy fetches each response once and serves it until it expires. Set the base URL
+option of the integration to the address of the proxy, e.g. http://proxy:8080/.
+
+The proxy needs only aiohttp and runs as a script:
+
+    python proxy.py --host 0.0.0.0 --port 8080
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from email.utils import parsedate_to_datetime
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, web
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TTL = 600
+DEFAULT_UPSTREAM = "https://dataservice.accuweather.com/"
+RATE_LIMIT_REMAINING = "RateLimit-Remaining"
+# Response headers used by the integration, passed through to the clients.
+FORWARDED_HEADERS = ("Content-Type", "ETag", "Expires", RATE_LIMIT_REMAINING)
+
+
+class CachingProxy:
+    """Serve AccuWeather API responses from a cache while they are valid.
+
+    Responses are cached by the path and the query without the API key, so clients
+    using different API keys for the same location share them. Concurrent requests
+    for a response which isn't cached wait for a single upstream request. The first
+    request with an API key is always forwarded, the API checks the key and returns
+    its remaining requests.
+    """
+
+    def __init__(self, session: ClientSession, upstream: str, ttl: int):
+        """Initialize."""
+        self._session = session
+        self._upstream = upstream.rstrip("/")
+        self._ttl = ttl
+        # Cache key: (valid until, status, headers, body)
+        self._cache = {}
+        self._in_flight = {}
+        # The last known remaining requests of each API key the API accepted, a
+        # cached response has those of the API key which fetched it.
+        self._requests_remaining = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _cache_key(request: web.Request) -> str:
+        """Return the cache key of the request."""
+        query = sorted(
+            (key, value)
+            for key, value in request.query.items()
+            if key.lower() != "apikey"
+        )
+        return request.path + "?" + "&".join(f"{key}={value}" for key, value in query)
+
+    def _valid_until(self, headers) -> float:
+        """Return the end of the validity window of a response."""
+        now = time.time()
+        try:
+            expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            expires = 0
+        return expires if expires > now else now + self._ttl
+
+    async def _async_fetch(self, request: web.Request):
+        """Fetch the response from the API, cache it if it is successful."""
+        api_key = request.query.get("apikey")
+        url = self._upstream + request.path_qs
+        async with self._session.get(url) as resp:
+            body = await resp.read()
+            headers = {
+                header: resp.headers[header]
+                for header in FORWARDED_HEADERS
+                if header in resp.headers
+            }
+        entry = (self._valid_until(headers), resp.status, headers, body)
+        if resp.status == 200:
+            self._requests_remaining[api_key] = headers.get(RATE_LIMIT_REMAINING)
+            self._cache[self._cache_key(request)] = entry
+        elif resp.status == 401:
+            self._requests_remaining.pop(api_key, None)
+        return entry
+
+    def _purge(self):
+        """Drop the expired responses."""
+        now = time.time()
+        for key in [key for key, entry in self._cache.items() if entry[0] <= now]:
+            del self._cache[key]
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Serve the request from the cache or from the API."""
+        key = self._cache_key(request)
+        api_key = request.query.get("apikey")
+        entry = self._cache.get(key)
+        if (
+            entry is not None
+            and entry[0] > time.time()
+            and api_key in self._requests_remaining
+        ):
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._purge()
+            # Requests with an API key the API hasn't accepted yet aren't joined to
+            # the requests of other API keys.
+            in_flight = key if api_key in self._requests_remaining else (key, api_key)
+            task = self._in_flight.get(in_flight)
+            if task is None:
+                task = asyncio.ensure_future(self._async_fetch(request))
+                self._in_flight[in_flight] = task
+                task.add_done_callback(lambda _: self._in_flight.pop(in_flight, None))
+            try:
+                entry = await asyncio.shield(task)
+            except (ClientError, asyncio.TimeoutError) as error:
+                _LOGGER.warning("Error fetching %s: %s", request.path, error)
+                return web.json_response({"Message": str(error)}, status=502)
+        _, status, headers, body = entry
+        headers = dict(headers)
+        remaining = self._requests_remaining.get(api_key)
+        if status == 200 and remaining is not None:
+            headers[RATE_LIMIT_REMAINING] = remaining
+        _LOGGER.debug("%s %s, hits: %s", status, key, self.hits)
+        return web.Response(status=status, headers=headers, body=body)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        """Return the cache statistics."""
+        return web.Response(
+            text=json.dumps(
+                {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+            ),
+            content_type="application/json",
+        )
+
+
+async def async_create_app(upstream: str = DEFAULT_UPSTREAM, ttl: int = DEFAULT_TTL):
+    """Return the web application of the proxy."""
+    session = ClientSession(timeout=ClientTimeout(total=10))
+    proxy = CachingProxy(session, upstream, ttl)
+    app = web.Application()
+    app.router.add_get("/_stats", proxy.handle_stats)
+    app.router.add_get("/{path:.*}", proxy.handle)
+
+    async def async_close_session(app):
+        """Close the upstream session."""
+        await session.close()
+
+    app.on_cleanup.append(async_close_session)
+    return app
+
+
+def main():
+    """Run the proxy."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM)
+    parser.add_argument(
+        "--ttl",
+        type=int,
+        default=DEFAULT_TTL,
+        help="seconds responses without an Expires header are served from the cache",
+    )
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    web.run_app(
+        async_create_app(args.upstream, args.ttl), host=args.host, port=args.port
+    )
+
+
+if __name__ == "__main__":
+    main()
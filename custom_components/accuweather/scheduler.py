@@ -0,0 +1,67 @@
+"""Quota aware update scheduler for AccuWeather."""
+import logging
+from datetime import datetime, timedelta
+from math import ceil
+from typing import Callable, Optional
+
+from homeassistant.util.dt import utcnow
+
+from .const import MIN_UPDATE_INTERVAL, REQUESTS_PER_DAY, REQUESTS_RESERVE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UpdateScheduler:
+    """Spread the remaining requests over the rest of the UTC day."""
+
+    def __init__(
+        self,
+        requests_per_update: int,
+        reserved_per_day: int = 0,
+        clock: Callable[[], datetime] = utcnow,
+    ):
+        """Initialize."""
+        self.requests_per_update = requests_per_update
+        # Requests used by other fetch stages, e.g. the forecast.
+        self.reserved_per_day = reserved_per_day
+        # Share of the quota of the API key allocated to this location.
+        self.share = 1.0
+        self._clock = clock
+
+    @property
+    def default_interval(self) -> timedelta:
+        """Return the interval used before the remaining quota is known."""
+        requests = (
+            int((REQUESTS_PER_DAY - REQUESTS_RESERVE) * self.share)
+            - self.reserved_per_day
+        )
+        return timedelta(days=1) / max(requests // self.requests_per_update, 1)
+
+    def next_interval(self, requests_remaining: Optional[int]) -> timedelta:
+        """Return the time to the next update."""
+        if requests_remaining is None:
+            return self.default_interval
+
+        now = self._clock()
+        midnight = (now + timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        reserved = ceil(self.reserved_per_day * ((midnight - now) / timedelta(days=1)))
+        requests = (
+            int((int(requests_remaining) - REQUESTS_RESERVE) * self.share) - reserved
+        )
+        updates = requests // self.requests_per_update
+        if updates <= 0:
+            # The quota is exhausted, wait for the reset at midnight UTC.
+            _LOGGER.debug("No requests left until %s", midnight)
+            return midnight - now
+
+        return max(MIN_UPDATE_INTERVAL, (midnight - now) / updates)
+
+    def refresh_spacing(self, requests_remaining: Optional[int]) -> timedelta:
+        """Return the minimum time between requested refreshes.
+
+        Requested refreshes run at most twice per scheduled update, the next
+        scheduled update spreads the requests they leave over the rest of the day.
+        """
+        return max(MIN_UPDATE_INTERVAL, self.next_interval(requests_remaining) / 2)
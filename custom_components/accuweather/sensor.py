@@ -1,26 +1,44 @@
 """Support for the AccuWeather service."""
-from homeassistant.const import (
-    ATTR_ATTRIBUTION,
-    ATTR_DEVICE_CLASS,
-    CONF_NAME,
-    DEVICE_CLASS_TEMPERATURE,
-)
-from homeassistant.helpers.entity import Entity
+from datetime import timedelta
+from operator import attrgetter, methodcaller
+
+from homeassistant.const import ATTR_ATTRIBUTION, ATTR_DEVICE_CLASS, CONF_NAME
 
 from .const import (
-    ATTR_FORECAST,
+    ALL_FIELDS,
+    ATTR_AGGREGATE,
+    ATTR_ATTRIBUTES,
+    ATTR_ENDPOINT,
+    ATTR_FIELD,
     ATTR_ICON,
     ATTR_LABEL,
+    ATTR_UNIT_IMPERIAL,
+    ATTR_UNIT_METRIC,
     ATTRIBUTION,
     COORDINATOR,
+    DIAGNOSTIC_SENSOR_TYPES,
     DOMAIN,
-    FORECAST_DAYS,
+    ENDPOINT_CURRENT_CONDITIONS,
+    ENDPOINT_FORECAST,
+    ENDPOINT_HISTORICAL_CONDITIONS,
+    ENDPOINT_HOURLY_FORECAST,
     FORECAST_SENSOR_TYPES,
+    HOURLY_SENSOR_TYPES,
+    LOCAL_SENSOR_TYPES,
+    NOWCAST_SENSOR_TYPES,
     OPTIONAL_SENSORS,
     SENSOR_TYPES,
 )
+from .entity import (
+    AccuWeatherCoordinatorEntity,
+    async_get_disabled_unique_ids,
+    sensor_unique_id,
+)
+from .units import convert
 
 PARALLEL_UPDATES = 1
+# Only the sensors estimating values between the API polls are polled.
+SCAN_INTERVAL = timedelta(minutes=5)
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
@@ -29,135 +47,181 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
 
+    # Entities disabled in the entity registry are not created at all. When the user
+    # enables one, Home Assistant reloads the config entry and it is created then.
+    disabled = await async_get_disabled_unique_ids(hass, config_entry)
+
+    def enabled(kind, forecast_day=None):
+        """Return True if the sensor is not disabled in the entity registry."""
+        return (
+            sensor_unique_id(coordinator.location_key, kind, forecast_day)
+            not in disabled
+        )
+
     sensors = []
     for sensor in SENSOR_TYPES:
-        sensors.append(AccuWeatherSensor(name, sensor, coordinator))
+        if enabled(sensor):
+            sensors.append(AccuWeatherSensor(name, sensor, coordinator))
 
     if coordinator.forecast:
         for sensor in FORECAST_SENSOR_TYPES:
-            for day in FORECAST_DAYS:
-                # Some air quality sensors are only available for certain locations.
-                if sensor in coordinator.data[ATTR_FORECAST][0]:
+            # Some air quality sensors are only available for certain locations.
+            field = FORECAST_SENSOR_TYPES[sensor][ATTR_FIELD]
+            if getattr(coordinator.data.forecast[0], field) is None:
+                continue
+            for day in range(coordinator.forecast_days):
+                if enabled(sensor, day):
                     sensors.append(
                         AccuWeatherSensor(name, sensor, coordinator, forecast_day=day)
                     )
 
+    if coordinator.hourly_forecast:
+        for sensor in HOURLY_SENSOR_TYPES:
+            if enabled(sensor):
+                sensors.append(AccuWeatherSensor(name, sensor, coordinator))
+
+    for sensor in LOCAL_SENSOR_TYPES:
+        if sensor == "TemperatureEstimate":
+            # The estimate moves toward the hourly forecast.
+            if coordinator.hourly_forecast and enabled(sensor):
+                sensors.append(AccuWeatherEstimateSensor(name, sensor, coordinator))
+        elif enabled(sensor):
+            sensors.append(AccuWeatherSensor(name, sensor, coordinator))
+
+    if coordinator.nowcast is not None:
+        for sensor, description in NOWCAST_SENSOR_TYPES.items():
+            if description[ATTR_ENDPOINT] in coordinator.nowcast.endpoints and enabled(
+                sensor
+            ):
+                sensors.append(AccuWeatherNowcastSensor(name, sensor, coordinator))
+
+    # The latency sensors of the endpoints the location doesn't fetch stay empty.
+    endpoints = {
+        ENDPOINT_CURRENT_CONDITIONS,
+        ENDPOINT_HISTORICAL_CONDITIONS,
+        *coordinator.nowcast_endpoints,
+    }
+    if coordinator.forecast:
+        endpoints.add(ENDPOINT_FORECAST)
+    if coordinator.hourly_forecast:
+        endpoints.add(ENDPOINT_HOURLY_FORECAST)
+    for sensor, description in DIAGNOSTIC_SENSOR_TYPES.items():
+        if description.get(ATTR_ENDPOINT, ENDPOINT_CURRENT_CONDITIONS) not in endpoints:
+            continue
+        if enabled(sensor):
+            sensors.append(AccuWeatherDiagnosticSensor(name, sensor, coordinator))
+
     async_add_entities(sensors, False)
 
 
-class AccuWeatherSensor(Entity):
+class AccuWeatherSensor(AccuWeatherCoordinatorEntity):
     """Define an AccuWeather entity."""
 
     def __init__(self, name, kind, coordinator, forecast_day=None):
         """Initialize."""
+        super().__init__(coordinator)
         self._name = name
         self.kind = kind
-        self.coordinator = coordinator
-        self._device_class = None
         self._attrs = {ATTR_ATTRIBUTION: ATTRIBUTION}
-        self._unit_system = "Metric" if self.coordinator.is_metric else "Imperial"
         self.forecast_day = forecast_day
+        # The description, the snapshot and the extractors of the state and the
+        # attributes are resolved once, reading the state is a single lookup.
+        if forecast_day is not None:
+            self._description = FORECAST_SENSOR_TYPES[kind]
+            self._get_data = lambda coordinator: coordinator.data.forecast[forecast_day]
+        elif kind in HOURLY_SENSOR_TYPES:
+            self._description = HOURLY_SENSOR_TYPES[kind]
+            self._get_data = attrgetter("data.hourly")
+        elif kind in LOCAL_SENSOR_TYPES:
+            self._description = LOCAL_SENSOR_TYPES[kind]
+            self._get_data = attrgetter("local")
+        elif kind in NOWCAST_SENSOR_TYPES:
+            self._description = NOWCAST_SENSOR_TYPES[kind]
+            self._get_data = attrgetter("nowcast.data")
+        elif kind in DIAGNOSTIC_SENSOR_TYPES:
+            self._description = DIAGNOSTIC_SENSOR_TYPES[kind]
+            self._get_data = attrgetter("metrics")
+        else:
+            self._description = SENSOR_TYPES[kind]
+            self._get_data = attrgetter("data.current")
+        fields = [
+            self._description[ATTR_FIELD],
+            *self._description.get(ATTR_ATTRIBUTES, {}).values(),
+        ]
+        if forecast_day is not None:
+            self._paths = [f"forecast[{forecast_day}].{field}" for field in fields]
+        elif kind in SENSOR_TYPES:
+            self._paths = [f"current.{field}" for field in fields]
+        elif kind in HOURLY_SENSOR_TYPES:
+            self._paths = ["hourly"]
+        else:
+            # Metrics and local values change with every update.
+            self._paths = [ALL_FIELDS]
+        if ATTR_AGGREGATE in self._description:
+            self._get_state = methodcaller(
+                self._description[ATTR_AGGREGATE], self._description[ATTR_FIELD]
+            )
+        else:
+            self._get_state = attrgetter(self._description[ATTR_FIELD])
+        self._get_attrs = {
+            attr: attrgetter(field)
+            for attr, field in self._description.get(ATTR_ATTRIBUTES, {}).items()
+        }
+
+    @property
+    def _data_paths(self):
+        """Return the data paths the state of the entity depends on."""
+        return self._paths
 
     @property
     def name(self):
         """Return the name."""
         if self.forecast_day is not None:
-            return f"{self._name} {FORECAST_SENSOR_TYPES[self.kind][ATTR_LABEL]} {self.forecast_day}d"
-        return f"{self._name} {SENSOR_TYPES[self.kind][ATTR_LABEL]}"
+            return f"{self._name} {self._description[ATTR_LABEL]} {self.forecast_day}d"
+        if self.kind in HOURLY_SENSOR_TYPES:
+            hours = self.coordinator.hourly_forecast
+            return f"{self._name} {self._description[ATTR_LABEL]} {hours}h"
+        return f"{self._name} {self._description[ATTR_LABEL]}"
 
     @property
     def unique_id(self):
         """Return a unique_id for this entity."""
-        if self.forecast_day is not None:
-            return f"{self.coordinator.location_key}-{self.kind}-{self.forecast_day}".lower()
-        return f"{self.coordinator.location_key}-{self.kind}".lower()
-
-    @property
-    def should_poll(self):
-        """Return the polling requirement of the entity."""
-        return False
-
-    @property
-    def available(self):
-        """Return True if entity is available."""
-        return self.coordinator.last_update_success
+        return sensor_unique_id(
+            self.coordinator.location_key, self.kind, self.forecast_day
+        )
 
     @property
     def state(self):
         """Return the state."""
-        if self.forecast_day is not None:
-            if (
-                FORECAST_SENSOR_TYPES[self.kind][ATTR_DEVICE_CLASS]
-                == DEVICE_CLASS_TEMPERATURE
-            ):
-                return self.coordinator.data[ATTR_FORECAST][self.forecast_day][
-                    self.kind
-                ]["Value"]
-            if self.kind in ["WindGustDay", "WindGustNight"]:
-                return self.coordinator.data[ATTR_FORECAST][self.forecast_day][
-                    self.kind
-                ]["Speed"]["Value"]
-            if self.kind in ["Grass", "Mold", "Ragweed", "Tree", "UVIndex", "Ozone"]:
-                return self.coordinator.data[ATTR_FORECAST][self.forecast_day][
-                    self.kind
-                ]["Value"]
-            return self.coordinator.data[ATTR_FORECAST][self.forecast_day][self.kind]
-        if self.kind == "Ceiling":
-            return round(self.coordinator.data[self.kind][self._unit_system]["Value"])
-        if self.kind == "PressureTendency":
-            return self.coordinator.data[self.kind]["LocalizedText"].lower()
-        if SENSOR_TYPES[self.kind][ATTR_DEVICE_CLASS] == DEVICE_CLASS_TEMPERATURE:
-            return self.coordinator.data[self.kind][self._unit_system]["Value"]
-        if self.kind == "Precipitation":
-            return self.coordinator.data["PrecipitationSummary"][self.kind][
-                self._unit_system
-            ]["Value"]
-        if self.kind == "WindGust":
-            return self.coordinator.data[self.kind]["Speed"][self._unit_system]["Value"]
-        return self.coordinator.data[self.kind]
+        return convert(
+            self._get_state(self._get_data(self.coordinator)),
+            self._description[ATTR_UNIT_METRIC],
+            self.coordinator.is_metric,
+        )
 
     @property
     def icon(self):
         """Return the icon."""
-        if self.forecast_day is not None:
-            return FORECAST_SENSOR_TYPES[self.kind][ATTR_ICON]
-        return SENSOR_TYPES[self.kind][ATTR_ICON]
+        return self._description[ATTR_ICON]
 
     @property
     def device_class(self):
         """Return the device_class."""
-        if self.forecast_day is not None:
-            return FORECAST_SENSOR_TYPES[self.kind][ATTR_DEVICE_CLASS]
-        return SENSOR_TYPES[self.kind][ATTR_DEVICE_CLASS]
+        return self._description[ATTR_DEVICE_CLASS]
 
     @property
     def unit_of_measurement(self):
         """Return the unit the value is expressed in."""
-        if self.forecast_day is not None:
-            return FORECAST_SENSOR_TYPES[self.kind][self._unit_system]
-        return SENSOR_TYPES[self.kind][self._unit_system]
+        if self.coordinator.is_metric:
+            return self._description[ATTR_UNIT_METRIC]
+        return self._description[ATTR_UNIT_IMPERIAL]
 
     @property
     def device_state_attributes(self):
         """Return the state attributes."""
-        if self.forecast_day is not None:
-            if self.kind == "WindGustDay":
-                self._attrs["direction"] = self.coordinator.data[ATTR_FORECAST][
-                    self.forecast_day
-                ][self.kind]["Direction"]["English"]
-            elif self.kind == "WindGustNight":
-                self._attrs["direction"] = self.coordinator.data[ATTR_FORECAST][
-                    self.forecast_day
-                ][self.kind]["Direction"]["English"]
-            elif self.kind in ["Grass", "Mold", "Ragweed", "Tree", "UVIndex", "Ozone"]:
-                self._attrs["level"] = self.coordinator.data[ATTR_FORECAST][
-                    self.forecast_day
-                ][self.kind]["Category"]
-            return self._attrs
-        if self.kind == "UVIndex":
-            self._attrs["level"] = self.coordinator.data["UVIndexText"]
-        elif self.kind == "Precipitation":
-            self._attrs["type"] = self.coordinator.data["PrecipitationType"]
+        data = self._get_data(self.coordinator)
+        for attr, get_attr in self._get_attrs.items():
+            self._attrs[attr] = get_attr(data)
         return self._attrs
 
     @property
@@ -165,12 +229,48 @@ class AccuWeatherSensor(Entity):
         """Return if the entity should be enabled when first added to the entity registry."""
         return bool(self.kind not in OPTIONAL_SENSORS)
 
+
+class AccuWeatherEstimateSensor(AccuWeatherSensor):
+    """Define an AccuWeather entity estimating a value between the API polls."""
+
+    @property
+    def should_poll(self):
+        """Return the polling requirement of the entity."""
+        return True
+
+    async def async_update(self):
+        """Compute the estimate, no data is requested from the API."""
+
+
+class AccuWeatherNowcastSensor(AccuWeatherSensor):
+    """Define an AccuWeather entity using the nowcast data."""
+
+    @property
+    def available(self):
+        """Return True if entity is available."""
+        return self.coordinator.nowcast.last_update_success
+
     async def async_added_to_hass(self):
         """Connect to dispatcher listening for entity data notifications."""
+        self._last_written = self._state_to_write()
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.nowcast.async_add_listener(self._handle_coordinator_update)
         )
 
     async def async_update(self):
         """Update AccuWeather entity."""
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.nowcast.async_request_refresh()
+
+
+class AccuWeatherDiagnosticSensor(AccuWeatherSensor):
+    """Define an AccuWeather diagnostic entity reporting the integration metrics."""
+
+    @property
+    def available(self):
+        """Return True if entity is available."""
+        return True
+
+    @property
+    def entity_registry_enabled_default(self):
+        """Return if the entity should be enabled when first added to the entity registry."""
+        return False
@@ -0,0 +1,33 @@
+"""Conversion of the AccuWeather data to the configured unit system."""
+from homeassistant.const import (
+    LENGTH_KILOMETERS,
+    LENGTH_METERS,
+    PRESSURE_MBAR,
+    SPEED_KILOMETERS_PER_HOUR,
+    TEMP_CELSIUS,
+    TIME_HOURS,
+)
+
+from .const import LENGTH_MILIMETERS
+
+# The data is kept in metric units. Metric unit: (factor, offset, digits) of the
+# conversion to the imperial unit, units missing here are the same in both systems.
+IMPERIAL_CONVERSIONS = {
+    LENGTH_KILOMETERS: (0.621371, 0, 1),
+    LENGTH_METERS: (3.28084, 0, 0),
+    LENGTH_MILIMETERS: (0.0393701, 0, 2),
+    PRESSURE_MBAR: (0.02953, 0, 2),
+    f"{PRESSURE_MBAR}/{TIME_HOURS}": (0.02953, 0, 3),
+    SPEED_KILOMETERS_PER_HOUR: (0.621371, 0, 1),
+    TEMP_CELSIUS: (1.8, 32, 1),
+    f"{TEMP_CELSIUS}/{TIME_HOURS}": (1.8, 0, 1),
+}
+
+
+def convert(value, unit: str, is_metric: bool):
+    """Return the value in the metric unit converted to the unit system."""
+    if is_metric or value is None or unit not in IMPERIAL_CONVERSIONS:
+        return value
+    factor, offset, digits = IMPERIAL_CONVERSIONS[unit]
+    value = round(value * factor + offset, digits)
+    return int(value) if digits == 0 else value
@@ -1,6 +1,4 @@
 """Support for the AccuWeather service."""
-from statistics import mean
-
 from homeassistant.components.weather import (
     ATTR_FORECAST_CONDITION,
     ATTR_FORECAST_PRECIPITATION,
@@ -12,10 +10,29 @@ from homeassistant.components.weather import (
     ATTR_FORECAST_WIND_SPEED,
     WeatherEntity,
 )
-from homeassistant.const import CONF_NAME, STATE_UNKNOWN, TEMP_CELSIUS, TEMP_FAHRENHEIT
+from homeassistant.const import (
+    CONF_NAME,
+    LENGTH_KILOMETERS,
+    PRESSURE_MBAR,
+    SPEED_KILOMETERS_PER_HOUR,
+    STATE_UNKNOWN,
+    TEMP_CELSIUS,
+)
 from homeassistant.util.dt import utc_from_timestamp
 
-from .const import ATTR_FORECAST, ATTRIBUTION, CONDITION_CLASSES, COORDINATOR, DOMAIN
+from .const import (
+    ATTR_DATA_AGE,
+    ATTR_NEXT_UPDATE,
+    ATTR_STALE,
+    ATTRIBUTION,
+    CONDITION_MAP,
+    COORDINATOR,
+    DOMAIN,
+    LENGTH_MILIMETERS,
+)
+from .entity import AccuWeatherCoordinatorEntity
+from .model import HourlyForecast
+from .units import convert
 
 PARALLEL_UPDATES = 1
 
@@ -26,22 +43,30 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
 
-    async_add_entities([AccuWeatherEntity(name, coordinator)], False)
+    entities = [AccuWeatherEntity(name, coordinator)]
+    if coordinator.hourly_forecast:
+        entities.append(AccuWeatherEntity(name, coordinator, hourly=True))
 
+    async_add_entities(entities, False)
 
-class AccuWeatherEntity(WeatherEntity):
+
+class AccuWeatherEntity(AccuWeatherCoordinatorEntity, WeatherEntity):
     """Define an AccuWeather entity."""
 
-    def __init__(self, name, coordinator):
+    def __init__(self, name, coordinator, hourly=False):
         """Initialize."""
+        super().__init__(coordinator)
         self._name = name
-        self.coordinator = coordinator
+        self._hourly = hourly
         self._attrs = {}
-        self._unit_system = "Metric" if self.coordinator.is_metric else "Imperial"
+        self._forecast = None
+        self._forecast_source = None
 
     @property
     def name(self):
         """Return the name."""
+        if self._hourly:
+            return f"{self._name} Hourly"
         return self._name
 
     @property
@@ -52,128 +77,139 @@ class AccuWeatherEntity(WeatherEntity):
     @property
     def unique_id(self):
         """Return a unique_id for this entity."""
+        if self._hourly:
+            return f"{self.coordinator.location_key}-hourly"
         return self.coordinator.location_key
 
-    @property
-    def should_poll(self):
-        """Return the polling requirement of the entity."""
-        return False
-
-    @property
-    def available(self):
-        """Return True if entity is available."""
-        return self.coordinator.last_update_success
-
     @property
     def condition(self):
         """Return the current condition."""
-        try:
-            return [
-                k
-                for k, v in CONDITION_CLASSES.items()
-                if self.coordinator.data["WeatherIcon"] in v
-            ][0]
-        except IndexError:
-            return STATE_UNKNOWN
+        return CONDITION_MAP.get(
+            self.coordinator.data.current.weather_icon, STATE_UNKNOWN
+        )
 
     @property
     def temperature(self):
         """Return the temperature."""
-        return self.coordinator.data["Temperature"][self._unit_system]["Value"]
+        return self.coordinator.data.current.temperature
 
     @property
     def temperature_unit(self):
         """Return the unit of measurement."""
-        return TEMP_CELSIUS if self.coordinator.is_metric else TEMP_FAHRENHEIT
+        # The weather component converts temperatures to the unit system.
+        return TEMP_CELSIUS
 
     @property
     def pressure(self):
         """Return the pressure."""
-        return self.coordinator.data["Pressure"][self._unit_system]["Value"]
+        return convert(
+            self.coordinator.data.current.pressure,
+            PRESSURE_MBAR,
+            self.coordinator.is_metric,
+        )
 
     @property
     def humidity(self):
         """Return the humidity."""
-        return self.coordinator.data["RelativeHumidity"]
+        return self.coordinator.data.current.relative_humidity
 
     @property
     def wind_speed(self):
         """Return the wind speed."""
-        return self.coordinator.data["Wind"]["Speed"][self._unit_system]["Value"]
+        return convert(
+            self.coordinator.data.current.wind_speed,
+            SPEED_KILOMETERS_PER_HOUR,
+            self.coordinator.is_metric,
+        )
 
     @property
     def wind_bearing(self):
         """Return the wind bearing."""
-        return self.coordinator.data["Wind"]["Direction"]["Degrees"]
+        return self.coordinator.data.current.wind_bearing
 
     @property
     def visibility(self):
         """Return the visibility."""
-        return self.coordinator.data["Visibility"][self._unit_system]["Value"]
+        return convert(
+            self.coordinator.data.current.visibility,
+            LENGTH_KILOMETERS,
+            self.coordinator.is_metric,
+        )
 
     @property
     def ozone(self):
         """Return the ozone level."""
         # We only have ozone data for certain locations and only in the forecast data.
-        if self.coordinator.forecast and self.coordinator.data[ATTR_FORECAST][0].get(
-            "Ozone"
-        ):
-            return self.coordinator.data[ATTR_FORECAST][0]["Ozone"]["Value"]
+        if self.coordinator.forecast:
+            return self.coordinator.data.forecast[0].ozone
         return None
 
+    @property
+    def device_state_attributes(self):
+        """Return the state attributes."""
+        self._attrs[ATTR_NEXT_UPDATE] = self.coordinator.next_update.isoformat()
+        self._attrs[ATTR_STALE] = sorted(self.coordinator.stale_sections)
+        data_age = self.coordinator.data_age
+        self._attrs[ATTR_DATA_AGE] = (
+            round(data_age.total_seconds() / 60) if data_age is not None else None
+        )
+        return self._attrs
+
     @property
     def forecast(self):
         """Return the forecast array."""
-        if self.coordinator.forecast:
-            # remap keys from library to keys understood by the weather component
-            forecast = [
-                {
-                    ATTR_FORECAST_TIME: utc_from_timestamp(
-                        item["EpochDate"]
-                    ).isoformat(),
-                    ATTR_FORECAST_TEMP: item["TemperatureMax"]["Value"],
-                    ATTR_FORECAST_TEMP_LOW: item["TemperatureMin"]["Value"],
-                    ATTR_FORECAST_PRECIPITATION: self._calc_precipitation(item),
-                    ATTR_FORECAST_PRECIPITATION_PROBABILITY: round(
-                        mean(
-                            [
-                                item["PrecipitationProbabilityDay"],
-                                item["PrecipitationProbabilityNight"],
-                            ]
-                        )
-                    ),
-                    ATTR_FORECAST_WIND_SPEED: item["WindDay"]["Speed"]["Value"],
-                    ATTR_FORECAST_WIND_BEARING: item["WindDay"]["Direction"]["Degrees"],
-                    ATTR_FORECAST_CONDITION: [
-                        k for k, v in CONDITION_CLASSES.items() if item["IconDay"] in v
-                    ][0],
-                }
-                for item in self.coordinator.data[ATTR_FORECAST]
-            ]
-            return forecast
-        return None
+        if self._hourly:
+            source, remap = self.coordinator.data.hourly, self._convert_hourly
+        elif self.coordinator.forecast:
+            source, remap = self.coordinator.data.forecast, self._convert_forecast
+        else:
+            return None
+        # The forecast is converted once per forecast data update or unit change.
+        is_metric = self.coordinator.is_metric
+        if (source, is_metric) != self._forecast_source:
+            self._forecast_source = (source, is_metric)
+            self._forecast = remap(source, is_metric)
+        return self._forecast
 
-    async def async_added_to_hass(self):
-        """Connect to dispatcher listening for entity data notifications."""
-        self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
-        )
-
-    async def async_update(self):
-        """Update AccuWeather entity."""
-        await self.coordinator.async_request_refresh()
+    @staticmethod
+    def _convert_forecast(data: list, is_metric: bool) -> list:
+        """Remap fields to keys understood by the weather component."""
+        return [
+            {
+                ATTR_FORECAST_TIME: utc_from_timestamp(day.epoch_date).isoformat(),
+                ATTR_FORECAST_TEMP: day.temperature_max,
+                ATTR_FORECAST_TEMP_LOW: day.temperature_min,
+                ATTR_FORECAST_PRECIPITATION: convert(
+                    day.precipitation, LENGTH_MILIMETERS, is_metric
+                ),
+                ATTR_FORECAST_PRECIPITATION_PROBABILITY: day.precipitation_probability,
+                ATTR_FORECAST_WIND_SPEED: convert(
+                    day.wind_speed_day, SPEED_KILOMETERS_PER_HOUR, is_metric
+                ),
+                ATTR_FORECAST_WIND_BEARING: day.wind_bearing_day,
+                ATTR_FORECAST_CONDITION: CONDITION_MAP.get(day.icon_day),
+            }
+            for day in data
+        ]
 
     @staticmethod
-    def _calc_precipitation(day: dict) -> float:
-        """Return sum of the precipitation."""
-        precip_sum = 0
-        precip_types = ["Rain", "Snow", "Ice"]
-        for precip in precip_types:
-            precip_sum = sum(
-                [
-                    precip_sum,
-                    day[f"{precip}Day"]["Value"],
-                    day[f"{precip}Night"]["Value"],
-                ]
-            )
-        return round(precip_sum, 1)
+    def _convert_hourly(data: HourlyForecast, is_metric: bool) -> list:
+        """Remap hourly fields to keys understood by the weather component."""
+        return [
+            {
+                ATTR_FORECAST_TIME: utc_from_timestamp(hour["epoch_date"]).isoformat(),
+                ATTR_FORECAST_TEMP: hour["temperature"],
+                ATTR_FORECAST_PRECIPITATION: convert(
+                    hour["precipitation"], LENGTH_MILIMETERS, is_metric
+                ),
+                ATTR_FORECAST_PRECIPITATION_PROBABILITY: hour[
+                    "precipitation_probability"
+                ],
+                ATTR_FORECAST_WIND_SPEED: convert(
+                    hour["wind_speed"], SPEED_KILOMETERS_PER_HOUR, is_metric
+                ),
+                ATTR_FORECAST_WIND_BEARING: hour["wind_bearing"],
+                ATTR_FORECAST_CONDITION: CONDITION_MAP.get(hour["weather_icon"]),
+            }
+            for hour in data.rows()
+        ]
@@ -0,0 +1,12 @@
+"""Fixtures of the AccuWeather integration tests."""
+import pytest
+
+from benchmarks.harness import async_close_environment, async_create_environment
+
+
+@pytest.fixture
+async def env(tmp_path):
+    """Return a coordinator updated from the fake API."""
+    environment = await async_create_environment(str(tmp_path))
+    yield environment
+    await async_close_environment(environment)
@@ -0,0 +1,145 @@
+"""Tests of the AccuWeather config flow."""
+import pytest
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
+
+from benchmarks.fake_api import VALID_API_KEY
+from benchmarks.harness import LOCATION_KEY
+from custom_components.accuweather import update_listener
+from custom_components.accuweather.config_flow import (
+    AccuWeatherFlowHandler,
+    AccuWeatherOptionsFlowHandler,
+)
+from custom_components.accuweather.const import (
+    ATTR_LOCATION_KEY,
+    CONF_API_KEYS,
+    CONF_BASE_URL,
+    CONF_PRIORITY,
+    DOMAIN,
+    OPTIONS,
+)
+from custom_components.accuweather.locations import async_get_location_cache
+
+SECOND_API_KEY = "fedcba9876543210fedcba9876543210"
+USER_INPUT = {CONF_NAME: "Home", CONF_LATITUDE: 52.23, CONF_LONGITUDE: 21.01}
+
+
+async def _async_start_flow(env, api_key: str) -> dict:
+    """Return the result of the user step with a cached location."""
+    env.hass.config_entries = ConfigEntries(env.hass, {})
+    locations = await async_get_location_cache(env.hass)
+    locations.set(USER_INPUT[CONF_LATITUDE], USER_INPUT[CONF_LONGITUDE], LOCATION_KEY)
+    flow = AccuWeatherFlowHandler()
+    flow.hass = env.hass
+    flow.context = {}
+    return await flow.async_step_user({**USER_INPUT, CONF_API_KEY: api_key})
+
+
+def _options_flow(env) -> AccuWeatherOptionsFlowHandler:
+    """Return the options flow of the config entry."""
+    env.hass.config_entries = ConfigEntries(env.hass, {})
+    flow = AccuWeatherOptionsFlowHandler(env.config_entry)
+    flow.hass = env.hass
+    return flow
+
+
+async def test_cached_location_invalid_api_key(env):
+    """Test the format of the API key is checked when the location is cached."""
+    result = await _async_start_flow(env, "invalid")
+    assert result["type"] == "form"
+    assert result["errors"] == {CONF_API_KEY: "invalid_api_key"}
+    assert env.api.requests["location"] == 0
+
+
+async def test_cached_location(env):
+    """Test a cached location doesn't use a request."""
+    result = await _async_start_flow(env, VALID_API_KEY)
+    assert result["type"] == "create_entry"
+    assert env.api.requests["location"] == 0
+
+
+async def test_options_invalid_api_keys(env):
+    """Test the options form rejects API keys which have not the format of one."""
+    flow = _options_flow(env)
+    result = await flow.async_step_user(
+        {CONF_API_KEY: VALID_API_KEY, CONF_API_KEYS: f"{VALID_API_KEY}, invalid"}
+    )
+    assert result["type"] == "form"
+    assert result["errors"] == {CONF_API_KEYS: "invalid_api_key"}
+
+    result = await flow.async_step_user({CONF_API_KEY: "invalid", CONF_API_KEYS: ""})
+    assert result["errors"] == {CONF_API_KEY: "invalid_api_key"}
+
+
+@pytest.mark.parametrize(
+    "base_url, errors",
+    [
+        ("", {}),
+        ("http://proxy:8080/", {}),
+        ("proxy:8080", {CONF_BASE_URL: "invalid_url"}),
+        ("ftp://proxy/", {CONF_BASE_URL: "invalid_url"}),
+    ],
+)
+async def test_options_base_url(env, base_url, errors):
+    """Test the base URL option is empty or an http URL."""
+    flow = _options_flow(env)
+    result = await flow.async_step_user(
+        {CONF_API_KEY: VALID_API_KEY, CONF_API_KEYS: "", CONF_BASE_URL: base_url}
+    )
+    assert result.get("errors", {}) == errors
+
+
+async def test_options_reload_once(env):
+    """Test saving the options and the API keys reloads the entry once."""
+    flow = _options_flow(env)
+    reloads = []
+
+    async def async_reload(entry_id):
+        reloads.append(entry_id)
+
+    env.hass.config_entries.async_reload = async_reload
+    env.config_entry.add_update_listener(update_listener)
+    env.hass.data[DOMAIN][env.config_entry.entry_id][OPTIONS] = dict(
+        env.config_entry.options
+    )
+
+    result = await flow.async_step_user(
+        {
+            **env.config_entry.options,
+            CONF_API_KEY: VALID_API_KEY,
+            CONF_API_KEYS: SECOND_API_KEY,
+            CONF_BASE_URL: "",
+            CONF_PRIORITY: 2,
+        }
+    )
+    # The config entries manager stores the options of the finished flow.
+    env.hass.config_entries.async_update_entry(env.config_entry, options=result["data"])
+    await env.hass.async_block_till_done()
+    assert reloads == [env.config_entry.entry_id]
+
+
+async def test_reauth_entry_removed(env):
+    """Test the reauth flow aborts when the entry doesn't exist anymore."""
+    env.hass.config_entries = ConfigEntries(env.hass, {})
+    flow = AccuWeatherFlowHandler()
+    flow.hass = env.hass
+    flow.context = {}
+    result = await flow.async_step_reauth({ATTR_LOCATION_KEY: LOCATION_KEY})
+    assert result["type"] == "abort"
+    assert result["reason"] == "reauth_entry_removed"
+
+
+async def test_reauth_entry_removed_while_pending(env):
+    """Test the reauth confirmation aborts when the entry was removed meanwhile."""
+    env.hass.config_entries = ConfigEntries(env.hass, {})
+    env.hass.config_entries._entries.append(env.config_entry)
+    flow = AccuWeatherFlowHandler()
+    flow.hass = env.hass
+    flow.context = {}
+    result = await flow.async_step_reauth({ATTR_LOCATION_KEY: LOCATION_KEY})
+    assert result["type"] == "form"
+
+    env.hass.config_entries._entries.remove(env.config_entry)
+    result = await flow.async_step_reauth_confirm({CONF_API_KEY: VALID_API_KEY})
+    assert result["type"] == "abort"
+    assert result["reason"] == "reauth_entry_removed"
@@ -0,0 +1,338 @@
+"""Tests of the location coordinator against the fake API."""
+import asyncio
+from datetime import timedelta
+from time import monotonic
+
+import pytest
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_TIME_CHANGED,
+)
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.dt import utcnow
+
+from benchmarks.fake_api import VALID_API_KEY, load_fixture
+from custom_components.accuweather import AccuWeatherDataUpdateCoordinator, budget
+from custom_components.accuweather.const import ALL_FIELDS
+
+SECOND_API_KEY = "fedcba9876543210fedcba9876543210"
+
+
+async def _async_restart(env) -> AccuWeatherDataUpdateCoordinator:
+    """Write the cache to the disk and return a coordinator of the restarted location."""
+    env.hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await env.hass.async_block_till_done()
+    env.coordinator.release_budget()
+    coordinator = AccuWeatherDataUpdateCoordinator(
+        env.hass,
+        env.session,
+        [VALID_API_KEY],
+        env.coordinator.location_key,
+        True,
+        hourly_forecast=12,
+        base_url=env.api.url,
+    )
+    await coordinator.cache.async_load()
+    await coordinator.async_refresh()
+    return coordinator
+
+
+async def test_update(env):
+    """Test the first update fetches the current conditions and the forecasts."""
+    assert env.api.requests["current_conditions"] == 1
+    assert env.api.requests["forecast"] == 1
+    assert env.api.requests["hourly_forecast"] == 1
+    assert env.coordinator.data.current.temperature == (
+        load_fixture("current_conditions")[0]["Temperature"]["Metric"]["Value"]
+    )
+
+
+async def test_requests_remaining(env):
+    """Test the budget follows the RateLimit-Remaining header."""
+    env.api.requests_remaining = 20
+    await env.coordinator.async_refresh()
+    assert int(env.coordinator.budget.requests_remaining) == 19
+
+
+async def test_requests_exceeded(env):
+    """Test the budget is exhausted until the reset when the API refuses requests."""
+    env.api.requests_remaining = 0
+    await env.coordinator.async_refresh()
+    assert not env.coordinator.last_update_success
+    assert env.coordinator.budget.exhausted
+    # No retries before the reset at midnight.
+    assert abs(
+        env.coordinator.next_update - env.coordinator.budget.exhausted_until
+    ) < timedelta(seconds=1)
+
+
+async def test_stale_current_conditions(env):
+    """Test the availability follows the age of stale current conditions."""
+    coordinator = env.coordinator
+    coordinator.max_data_age = timedelta(minutes=30)
+    env.api.errors["current_conditions"] = 500
+    # The forecast is updated, the current conditions are stale.
+    coordinator._forecast_next_update = utcnow()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data_available
+    coordinator.data_updated -= timedelta(minutes=30)
+    assert not coordinator.data_available
+
+
+async def test_stale_data_expires(env):
+    """Test the entities are notified when the stale data gets too old."""
+    coordinator = env.coordinator
+    coordinator.max_data_age = timedelta(minutes=30)
+    available = []
+    coordinator.async_add_field_listener(
+        [ALL_FIELDS], lambda: available.append(coordinator.data_available)
+    )
+    env.api.errors["current_conditions"] = 500
+    # The data gets too old in 30 seconds, before the retry of the update.
+    coordinator.data_updated = utcnow() - timedelta(minutes=29, seconds=30)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert available == [True]
+
+    coordinator.data_updated -= timedelta(seconds=30)
+    env.hass.bus.async_fire(
+        EVENT_TIME_CHANGED, {ATTR_NOW: utcnow() + timedelta(seconds=30)}
+    )
+    await env.hass.async_block_till_done()
+    assert available == [True, False]
+
+
+async def test_all_api_keys_exhausted(env):
+    """Test the location waits for the reset when all API keys are exhausted."""
+    coordinator = env.coordinator
+    env.api.api_keys.add(SECOND_API_KEY)
+    coordinator.set_api_keys([VALID_API_KEY, SECOND_API_KEY])
+    env.api.requests_remaining = 0
+
+    await coordinator.async_refresh()
+    assert coordinator.api_key == SECOND_API_KEY
+    await coordinator.async_refresh()
+    assert coordinator.api_key == SECOND_API_KEY
+    assert abs(coordinator.next_update - coordinator.budget.exhausted_until) < (
+        timedelta(seconds=1)
+    )
+
+    # Neither API key is tried again before the reset.
+    requests = env.api.request_count
+    await coordinator.async_refresh()
+    assert coordinator.api_key == SECOND_API_KEY
+    assert env.api.request_count == requests
+
+
+async def test_malformed_api_key_skipped(env):
+    """Test the rotation skips an API key which has not the format of one."""
+    coordinator = env.coordinator
+    coordinator.set_api_keys([VALID_API_KEY, "malformed"])
+    env.api.requests_remaining = 0
+
+    await coordinator.async_refresh()
+    assert coordinator.api_key == VALID_API_KEY
+    assert coordinator.budget.exhausted
+    coordinator.release_budget()
+
+
+async def test_backfill_once_a_day(env):
+    """Test a gap in the observations is backfilled at most once a day."""
+    coordinator = env.coordinator
+    coordinator._last_observed = (utcnow() - timedelta(hours=3)).timestamp()
+    await coordinator.async_refresh()
+    assert env.api.requests["historical_conditions"] == 1
+
+    coordinator._last_observed = (utcnow() - timedelta(hours=3)).timestamp()
+    await coordinator.async_refresh()
+    assert env.api.requests["historical_conditions"] == 1
+
+
+async def test_backfill_once_a_day_across_restarts(env):
+    """Test a restart doesn't backfill again within the day."""
+    coordinator = env.coordinator
+    coordinator._last_observed = (utcnow() - timedelta(hours=3)).timestamp()
+    await coordinator.async_refresh()
+    assert env.api.requests["historical_conditions"] == 1
+
+    # A restart after a gap, the cached current conditions are expired.
+    current = coordinator.cache._data["current_conditions"]
+    current["fetched"] = (utcnow() - timedelta(hours=3)).timestamp()
+    current["valid_until"] = current["fetched"]
+    coordinator._next_backfill = utcnow()
+    coordinator._restore_from_cache = True
+    await coordinator.async_refresh()
+    assert env.api.requests["current_conditions"] == 3
+    assert env.api.requests["historical_conditions"] == 1
+
+
+async def test_backfill_unexpected_error(env):
+    """Test an unexpected backfill error is counted and doesn't fail the update."""
+    coordinator = env.coordinator
+
+    async def async_fail(since):
+        raise ValueError
+
+    coordinator._async_update_historical_conditions = async_fail
+    coordinator._last_observed = (utcnow() - timedelta(hours=3)).timestamp()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.metrics.error_types == {"ValueError": 1}
+
+
+async def test_same_api_key_keeps_budget(env):
+    """Test new API keys with the same first one keep the budget of the key."""
+    coordinator = env.coordinator
+    env.api.requests_remaining = 20
+    await coordinator.async_refresh()
+    budget = coordinator.budget
+
+    coordinator.set_api_keys([VALID_API_KEY, SECOND_API_KEY])
+    assert coordinator.budget is budget
+    assert coordinator.budget.requests_remaining == "19"
+    assert coordinator.api_keys == [VALID_API_KEY, SECOND_API_KEY]
+
+
+async def test_concurrent_refreshes_share_fetch(env):
+    """Test concurrent refreshes join the refresh in flight."""
+    coordinator = env.coordinator
+    env.api.endpoint_latency["current_conditions"] = 0.05
+    await asyncio.gather(
+        coordinator.async_refresh(),
+        coordinator.async_refresh(),
+        coordinator.async_request_refresh(),
+    )
+    assert env.api.requests["current_conditions"] == 2
+    assert coordinator.metrics.coalesced["joined"] == 2
+    assert coordinator.metrics.coalesced["spaced"] == 0
+
+
+async def test_requested_refreshes_spaced(env):
+    """Test a refresh requested within the spacing of the last one is skipped."""
+    coordinator = env.coordinator
+    await coordinator.async_request_refresh()
+    assert env.api.requests["current_conditions"] == 1
+    assert coordinator.metrics.coalesced["spaced"] == 1
+
+    spacing = coordinator.scheduler.refresh_spacing(
+        coordinator.budget.requests_remaining
+    )
+    coordinator._last_refresh -= spacing.total_seconds()
+    await coordinator.async_request_refresh()
+    assert env.api.requests["current_conditions"] == 2
+    assert coordinator.metrics.coalesced["spaced"] == 1
+
+
+async def test_restart_served_from_cache(env):
+    """Test a restart with a fresh cache doesn't spend requests."""
+    coordinator = await _async_restart(env)
+    assert coordinator.last_update_success
+    assert env.api.request_count == 3
+    assert (
+        coordinator.data.current.temperature == env.coordinator.data.current.temperature
+    )
+    assert len(coordinator.data.forecast) == len(env.coordinator.data.forecast)
+    assert coordinator.data.hourly is not None
+    coordinator.release_budget()
+
+
+async def test_restart_refetches_expired_sections(env):
+    """Test the expired cached sections are fetched after a restart."""
+    env.coordinator.cache._data["forecast"]["valid_until"] = utcnow().timestamp()
+    coordinator = await _async_restart(env)
+    assert coordinator.last_update_success
+    assert env.api.requests["current_conditions"] == 1
+    assert env.api.requests["forecast"] == 2
+    assert env.api.requests["hourly_forecast"] == 1
+    assert "forecast" not in coordinator.stale_sections
+    coordinator.release_budget()
+
+
+async def test_failed_section_marked_stale(env):
+    """Test a failed section keeps its last data while the others are updated."""
+    coordinator = env.coordinator
+    forecast = coordinator.data.forecast
+    coordinator._forecast_next_update = utcnow()
+    env.api.errors["forecast"] = 500
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.stale_sections == {"forecast"}
+    assert coordinator.data.forecast is forecast
+    assert env.api.requests["current_conditions"] == 2
+
+    del env.api.errors["forecast"]
+    coordinator._forecast_next_update = utcnow()
+    await coordinator.async_refresh()
+    assert coordinator.stale_sections == set()
+    assert coordinator.data.forecast is not forecast
+
+
+async def test_missing_section_fails_update(env):
+    """Test the update fails when a section has no data to fall back to."""
+    env.coordinator.release_budget()
+    coordinator = AccuWeatherDataUpdateCoordinator(
+        env.hass,
+        env.session,
+        [VALID_API_KEY],
+        env.coordinator.location_key,
+        True,
+        base_url=env.api.url,
+    )
+    coordinator._restore_from_cache = False
+    env.api.errors["forecast"] = 500
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    assert coordinator.stale_sections == {"forecast"}
+    assert coordinator._current is not None
+    coordinator.release_budget()
+
+
+async def test_shared_api_key_budget(env, monkeypatch):
+    """Test locations sharing an API key split its quota and stagger the fetches."""
+    monkeypatch.setattr(budget, "FETCH_SPACING", 0.05)
+    coordinator = env.coordinator
+    other = AccuWeatherDataUpdateCoordinator(
+        env.hass,
+        env.session,
+        [VALID_API_KEY],
+        "other",
+        False,
+        priority=3 * coordinator.priority,
+        base_url=env.api.url,
+    )
+    other._restore_from_cache = False
+    assert other.budget is coordinator.budget
+    assert coordinator.scheduler.share == 0.25
+    assert other.scheduler.share == 0.75
+
+    start = monotonic()
+    await asyncio.gather(coordinator.async_refresh(), other.async_refresh())
+    assert monotonic() - start >= 0.05
+    assert env.api.requests["current_conditions"] == 3
+
+    other.release_budget()
+    assert coordinator.scheduler.share == 1
+
+
+async def test_field_listeners_notified_on_change(env):
+    """Test only the listeners of the changed data paths are notified."""
+    coordinator = env.coordinator
+    calls = {"current.temperature": 0, "current.pressure": 0, ALL_FIELDS: 0}
+    removers = [
+        coordinator.async_add_field_listener(
+            [path], lambda path=path: calls.update({path: calls[path] + 1})
+        )
+        for path in ("current.temperature", "current.pressure", ALL_FIELDS)
+    ]
+    env.api.responses["current_conditions"][0]["Temperature"]["Metric"]["Value"] += 1
+    await coordinator.async_refresh()
+    for remove_listener in removers:
+        remove_listener()
+    assert calls == {
+        "current.temperature": 1,
+        "current.pressure": 0,
+        ALL_FIELDS: 1,
+    }
+    assert coordinator.metrics.notifications == {"notified": 2, "filtered": 1}
@@ -0,0 +1,31 @@
+"""Tests of the parsed AccuWeather data."""
+from homeassistant.util.dt import utcnow
+
+from custom_components.accuweather.model import HourlyForecast
+
+
+def _hourly_forecast(first_hour: int, temperatures: list) -> HourlyForecast:
+    """Return an hourly forecast starting half an hour after first_hour from now."""
+    now = int(utcnow().timestamp()) + 1800
+    columns = {field: [None] * len(temperatures) for field in HourlyForecast.COLUMNS}
+    columns["epoch_date"] = [
+        now + (first_hour + hour) * 3600 for hour in range(len(temperatures))
+    ]
+    columns["temperature"] = temperatures
+    return HourlyForecast(columns)
+
+
+def test_window_starts_now():
+    """Test the hours which passed since the fetch are not aggregated."""
+    hourly = _hourly_forecast(-2, [30.0, 25.0, 10.0, 12.0, 14.0])
+    assert hourly.max_over("temperature") == 14.0
+    assert hourly.min_over("temperature", 2) == 10.0
+    assert hourly.max_over("temperature", 2) == 12.0
+    assert hourly.sum_over("temperature", 2) == 22.0
+
+
+def test_window_of_past_forecast():
+    """Test a forecast of past hours only has no values."""
+    hourly = _hourly_forecast(-3, [30.0, 25.0])
+    assert hourly.max_over("temperature") is None
+    assert hourly.sum_over("temperature") == 0
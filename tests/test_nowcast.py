@@ -0,0 +1,72 @@
+"""Tests of the alerts and MinuteCast nowcast."""
+from custom_components.accuweather.const import (
+    ENDPOINT_ALERTS,
+    ENDPOINT_MINUTECAST,
+    NOWCAST_BURST_UPDATES_PER_DAY,
+    NOWCAST_FAST_INTERVAL,
+    NOWCAST_SLOW_INTERVAL,
+)
+from custom_components.accuweather.nowcast import AccuWeatherNowcastCoordinator
+
+
+def _create_nowcast(env) -> AccuWeatherNowcastCoordinator:
+    """Return the nowcast coordinator of the location."""
+    env.coordinator.nowcast_endpoints = [ENDPOINT_ALERTS, ENDPOINT_MINUTECAST]
+    return AccuWeatherNowcastCoordinator(env.hass, env.coordinator, 52.23, 21.01)
+
+
+async def test_restart_served_from_cache(env):
+    """Test a restart within the update interval doesn't spend requests."""
+    nowcast = _create_nowcast(env)
+    await nowcast.async_refresh()
+    nowcast.async_stop()
+    assert env.api.requests[ENDPOINT_ALERTS] == 1
+    assert env.api.requests[ENDPOINT_MINUTECAST] == 1
+
+    restarted = _create_nowcast(env)
+    await restarted.async_refresh()
+    restarted.async_stop()
+    assert restarted.last_update_success
+    assert env.api.requests[ENDPOINT_ALERTS] == 1
+    assert env.api.requests[ENDPOINT_MINUTECAST] == 1
+    assert restarted.data.alert_details == nowcast.data.alert_details
+    assert restarted.data.minutecast.phrase == nowcast.data.minutecast.phrase
+    assert restarted.update_interval <= nowcast.update_interval
+
+
+async def test_restart_fetches_missing_section(env):
+    """Test a section enabled after the restart is fetched."""
+    env.coordinator.nowcast_endpoints = [ENDPOINT_ALERTS]
+    nowcast = AccuWeatherNowcastCoordinator(env.hass, env.coordinator, 52.23, 21.01)
+    await nowcast.async_refresh()
+    nowcast.async_stop()
+
+    restarted = _create_nowcast(env)
+    await restarted.async_refresh()
+    restarted.async_stop()
+    assert env.api.requests[ENDPOINT_ALERTS] == 1
+    assert env.api.requests[ENDPOINT_MINUTECAST] == 1
+
+
+async def test_bursts_limited_per_day(env):
+    """Test the fast updates stop when the reserved ones of the day are used."""
+    nowcast = _create_nowcast(env)
+    nowcast.precipitation_near = lambda data: True
+    await nowcast.async_refresh()
+    assert nowcast.bursting
+    assert nowcast.update_interval == NOWCAST_FAST_INTERVAL
+
+    for _ in range(NOWCAST_BURST_UPDATES_PER_DAY):
+        await nowcast.async_refresh()
+    nowcast.async_stop()
+    assert not nowcast.bursting
+    assert nowcast.update_interval == NOWCAST_SLOW_INTERVAL
+    assert env.api.requests[ENDPOINT_ALERTS] == NOWCAST_BURST_UPDATES_PER_DAY + 1
+
+    # A restart doesn't start another burst within the day.
+    restarted = _create_nowcast(env)
+    restarted.precipitation_near = lambda data: True
+    restarted._restore_from_cache = False
+    await restarted.async_refresh()
+    restarted.async_stop()
+    assert not restarted.bursting
@@ -0,0 +1,66 @@
+"""Tests of the caching proxy of the AccuWeather API."""
+import pytest
+from aiohttp import ClientSession, web
+
+from benchmarks.fake_api import VALID_API_KEY, FakeAccuWeatherAPI
+from custom_components.accuweather.proxy import RATE_LIMIT_REMAINING, async_create_app
+
+SECOND_API_KEY = "fedcba9876543210fedcba9876543210"
+UNKNOWN_API_KEY = "00000000000000000000000000000000"
+PATH = "currentconditions/v1/274663?details=true"
+
+
+@pytest.fixture
+async def proxy():
+    """Return the fake API and a client of the proxy in front of it."""
+    api = FakeAccuWeatherAPI(api_keys={VALID_API_KEY, SECOND_API_KEY})
+    await api.async_start()
+    runner = web.AppRunner(await async_create_app(api.url))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}/"
+    async with ClientSession() as session:
+
+        async def get(api_key: str):
+            async with session.get(f"{url}{PATH}&apikey={api_key}") as resp:
+                await resp.read()
+                return resp
+
+        yield api, get
+    await runner.cleanup()
+    await api.async_stop()
+
+
+async def test_cached_response(proxy):
+    """Test a response is fetched once for an API key the API accepted."""
+    api, get = proxy
+    first = await get(VALID_API_KEY)
+    second = await get(VALID_API_KEY)
+    assert first.status == second.status == 200
+    assert api.requests["current_conditions"] == 1
+    assert second.headers[RATE_LIMIT_REMAINING] == first.headers[RATE_LIMIT_REMAINING]
+
+
+async def test_unseen_api_key_forwarded(proxy):
+    """Test the first request of another API key gets its own remaining requests."""
+    api, get = proxy
+    await get(VALID_API_KEY)
+    resp = await get(SECOND_API_KEY)
+    assert resp.status == 200
+    assert api.requests["current_conditions"] == 2
+    assert resp.headers[RATE_LIMIT_REMAINING] == str(api.requests_remaining)
+
+    await get(SECOND_API_KEY)
+    assert api.requests["current_conditions"] == 2
+
+
+async def test_invalid_api_key_not_served_from_cache(proxy):
+    """Test an API key the API rejects gets the error, not the cached response."""
+    api, get = proxy
+    await get(VALID_API_KEY)
+    for _ in range(2):
+        resp = await get(UNKNOWN_API_KEY)
+        assert resp.status == 401
+        assert RATE_LIMIT_REMAINING not in resp.headers
+    assert api.requests["current_conditions"] == 3
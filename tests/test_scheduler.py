@@ -0,0 +1,124 @@
+"""Tests of the quota aware update scheduler."""
+from datetime import datetime, timedelta
+
+import pytest
+from homeassistant.util.dt import UTC
+
+from custom_components.accuweather.const import MIN_UPDATE_INTERVAL
+from custom_components.accuweather.scheduler import UpdateScheduler
+
+START_OF_DAY = datetime(2020, 7, 1, 0, 0, tzinfo=UTC)
+MIDDAY = datetime(2020, 7, 1, 12, 0, tzinfo=UTC)
+
+
+def scheduler_at(now, **kwargs):
+    """Return a scheduler using a clock stopped at now."""
+    return UpdateScheduler(1, clock=lambda: now, **kwargs)
+
+
+def test_default_interval():
+    """Test the interval used before the remaining quota is known."""
+    scheduler = scheduler_at(START_OF_DAY)
+    # 45 requests after the reserve of 5.
+    assert scheduler.default_interval == timedelta(days=1) / 45
+    assert scheduler.next_interval(None) == scheduler.default_interval
+
+
+def test_default_interval_reserved_and_share():
+    """Test the default interval leaves out the reserved requests and the share."""
+    scheduler = scheduler_at(START_OF_DAY, reserved_per_day=5)
+    scheduler.share = 0.5
+    # int(45 * 0.5) - 5 requests.
+    assert scheduler.default_interval == timedelta(days=1) / 17
+
+
+@pytest.mark.parametrize(
+    "now,remaining,expected",
+    [
+        (START_OF_DAY, 50, timedelta(days=1) / 45),
+        (START_OF_DAY, "50", timedelta(days=1) / 45),
+        (MIDDAY, 50, timedelta(hours=12) / 45),
+        (MIDDAY, 14, timedelta(hours=12) / 9),
+    ],
+)
+def test_spread_over_rest_of_day(now, remaining, expected):
+    """Test the remaining requests are spread over the rest of the UTC day."""
+    assert scheduler_at(now).next_interval(remaining) == expected
+
+
+def test_low_quota_backs_off():
+    """Test the interval grows as the quota runs low."""
+    scheduler = scheduler_at(START_OF_DAY)
+    intervals = [scheduler.next_interval(remaining) for remaining in (50, 20, 8, 6)]
+    assert intervals == sorted(intervals)
+    assert scheduler.next_interval(7) == timedelta(hours=12)
+
+
+def test_minimum_interval():
+    """Test plenty of requests late in the day don't poll faster than the minimum."""
+    scheduler = scheduler_at(datetime(2020, 7, 1, 23, 30, tzinfo=UTC))
+    assert scheduler.next_interval(50) == MIN_UPDATE_INTERVAL
+
+
+@pytest.mark.parametrize("remaining", [5, 3, 0])
+def test_exhausted_quota_waits_for_reset(remaining):
+    """Test an exhausted quota waits for the reset at midnight UTC."""
+    scheduler = scheduler_at(MIDDAY)
+    assert scheduler.next_interval(remaining) == timedelta(hours=12)
+
+
+def test_reserved_requests():
+    """Test the requests reserved for the rest of the day are left out."""
+    # Half of the 10 requests reserved per day are still needed at midday.
+    scheduler = scheduler_at(MIDDAY, reserved_per_day=10)
+    assert scheduler.next_interval(50) == timedelta(hours=12) / 40
+    # The reserved requests use up the quota.
+    assert scheduler.next_interval(10) == timedelta(hours=12)
+
+
+def test_share():
+    """Test the location gets only its share of the quota."""
+    scheduler = scheduler_at(START_OF_DAY)
+    scheduler.share = 0.25
+    # int(45 * 0.25) requests.
+    assert scheduler.next_interval(50) == timedelta(days=1) / 11
+
+
+def test_requests_per_update():
+    """Test updates needing more requests are less frequent."""
+    scheduler = UpdateScheduler(3, clock=lambda: START_OF_DAY)
+    assert scheduler.next_interval(50) == timedelta(days=1) / 15
+
+
+def test_simulated_day():
+    """Test a day of updates following the scheduler never runs out of requests."""
+    now = START_OF_DAY
+    scheduler = UpdateScheduler(1, clock=lambda: now)
+    remaining = 50
+    updates = 0
+    while now < START_OF_DAY + timedelta(days=1) and remaining > 5:
+        remaining -= 1
+        updates += 1
+        now += scheduler.next_interval(remaining)
+    assert remaining >= 5
+    assert updates >= 40
+    assert now >= START_OF_DAY + timedelta(days=1) - MIN_UPDATE_INTERVAL
+
+
+def test_refresh_spacing():
+    """Test requested refreshes are spaced by half of the scheduled interval."""
+    scheduler = scheduler_at(MIDDAY)
+    assert scheduler.refresh_spacing(14) == timedelta(hours=12) / 9 / 2
+    assert scheduler.refresh_spacing(None) == scheduler.default_interval / 2
+
+
+def test_refresh_spacing_minimum():
+    """Test the refresh spacing is at least the minimum update interval."""
+    scheduler = scheduler_at(datetime(2020, 7, 1, 23, 30, tzinfo=UTC))
+    assert scheduler.refresh_spacing(50) == MIN_UPDATE_INTERVAL
+
+
+def test_refresh_spacing_exhausted():
+    """Test requested refreshes wait for the reset when the quota is exhausted."""
+    scheduler = scheduler_at(MIDDAY)
+    assert scheduler.refresh_spacing(5) == timedelta(hours=6)
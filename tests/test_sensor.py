@@ -0,0 +1,61 @@
+"""Tests of the AccuWeather sensors."""
+from custom_components.accuweather import sensor
+
+
+async def _async_setup_sensors(env) -> dict:
+    """Return the sensors of the config entry by their kind."""
+    entities = []
+    await sensor.async_setup_entry(
+        env.hass, env.config_entry, lambda new, update=False: entities.extend(new)
+    )
+    return {entity.kind: entity for entity in entities}
+
+
+async def test_latency_sensors(env):
+    """Test a latency sensor is created for each endpoint the location fetches."""
+    sensors = await _async_setup_sensors(env)
+    assert {kind for kind in sensors if kind.startswith("Latency")} == {
+        "LatencyCurrentConditions",
+        "LatencyForecast",
+        "LatencyHistoricalConditions",
+        "LatencyHourlyForecast",
+    }
+    assert sensors["LatencyHourlyForecast"].state is not None
+    assert sum(
+        sensors["LatencyHourlyForecast"].device_state_attributes["histogram"].values()
+    ) == (env.api.requests["hourly_forecast"])
+    assert sensors["LatencyHistoricalConditions"].state is None
+
+
+async def test_nowcast_latency_sensors(env):
+    """Test the latency sensors of the enabled nowcast endpoints are created."""
+    env.coordinator.nowcast_endpoints = ["alerts"]
+    sensors = await _async_setup_sensors(env)
+    assert "LatencyAlerts" in sensors
+    assert "LatencyMinuteCast" not in sensors
+
+
+async def test_state_written_only_when_changed(env):
+    """Test the state is written only when the state or an attribute changed."""
+    entity = sensor.AccuWeatherSensor("Home", "Grass", env.coordinator, 0)
+    entity.hass = env.hass
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.state)
+    entity._last_written = entity._state_to_write()
+    state_writes = env.coordinator.metrics.state_writes
+    day = env.coordinator.data.forecast[0]
+
+    entity._handle_coordinator_update()
+    assert writes == []
+    assert state_writes == {"emitted": 0, "skipped": 1}
+
+    day.grass = (day.grass or 0) + 1
+    entity._handle_coordinator_update()
+    assert writes == [day.grass]
+    assert state_writes == {"emitted": 1, "skipped": 1}
+
+    day.grass_level = "High" if day.grass_level != "High" else "Low"
+    entity._handle_coordinator_update()
+    entity._handle_coordinator_update()
+    assert len(writes) == 2
+    assert state_writes == {"emitted": 2, "skipped": 2}
@@ -0,0 +1,41 @@
+"""Tests of the unit conversions."""
+import pytest
+from homeassistant.const import (
+    LENGTH_KILOMETERS,
+    LENGTH_METERS,
+    PRESSURE_MBAR,
+    SPEED_KILOMETERS_PER_HOUR,
+    TEMP_CELSIUS,
+    TIME_HOURS,
+    UNIT_PERCENTAGE,
+)
+
+from custom_components.accuweather.const import LENGTH_MILIMETERS
+from custom_components.accuweather.units import convert
+
+
+@pytest.mark.parametrize(
+    "value, unit, expected",
+    [
+        (23.1, TEMP_CELSIUS, 73.6),
+        (-40, TEMP_CELSIUS, -40),
+        (1.5, f"{TEMP_CELSIUS}/{TIME_HOURS}", 2.7),
+        (1012.0, PRESSURE_MBAR, 29.88),
+        (-1.5, f"{PRESSURE_MBAR}/{TIME_HOURS}", -0.044),
+        (14.5, SPEED_KILOMETERS_PER_HOUR, 9.0),
+        (16.1, LENGTH_KILOMETERS, 10.0),
+        (3200.0, LENGTH_METERS, 10499),
+        (7.4, LENGTH_MILIMETERS, 0.29),
+        (67, UNIT_PERCENTAGE, 67),
+        (None, TEMP_CELSIUS, None),
+    ],
+)
+def test_convert_imperial(value, unit, expected):
+    """Test the metric values are converted to the imperial units."""
+    assert convert(value, unit, False) == expected
+
+
+def test_convert_metric():
+    """Test the values stay in the metric units in the metric system."""
+    assert convert(23.1, TEMP_CELSIUS, True) == 23.1
+    assert convert(3200.0, LENGTH_METERS, True) == 3200.0
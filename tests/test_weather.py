@@ -0,0 +1,52 @@
+"""Tests of the weather entity."""
+import pytest
+from homeassistant.components.weather import ATTR_FORECAST_WIND_SPEED
+from homeassistant.util.dt import utcnow
+from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
+
+from benchmarks.bench_weather import ICONS, _scan_condition
+from custom_components.accuweather.weather import AccuWeatherEntity
+
+
+@pytest.mark.parametrize("icon", ICONS)
+async def test_condition(env, icon):
+    """Test the icon map gives the condition the scan of all conditions gives."""
+    entity = AccuWeatherEntity("Home", env.coordinator)
+    env.coordinator.data.current.weather_icon = icon
+    assert entity.condition == _scan_condition(icon)
+
+
+async def test_forecast_memoized(env):
+    """Test the forecast is converted again only for new forecast data."""
+    entity = AccuWeatherEntity("Home", env.coordinator)
+    forecast = entity.forecast
+    assert entity.forecast is forecast
+    env.coordinator._forecast_next_update = utcnow()
+    await env.coordinator.async_refresh()
+    assert entity.forecast is not forecast
+    assert entity.forecast == forecast
+
+
+async def test_imperial_units(env):
+    """Test the values are converted to the imperial unit system."""
+    entity = AccuWeatherEntity("Home", env.coordinator)
+    env.hass.config.units = IMPERIAL_SYSTEM
+    assert entity.pressure == 29.88
+    assert entity.wind_speed == 9.0
+    assert entity.visibility == 10.0
+
+
+async def test_unit_system_switched(env):
+    """Test the memoized forecast is converted again for a new unit system."""
+    entity = AccuWeatherEntity("Home", env.coordinator)
+    forecast = entity.forecast
+    env.hass.config.units = IMPERIAL_SYSTEM
+    imperial = entity.forecast
+    assert imperial is not forecast
+    assert imperial[0][ATTR_FORECAST_WIND_SPEED] == round(
+        forecast[0][ATTR_FORECAST_WIND_SPEED] * 0.621371, 1
+    )
+    assert entity.forecast is imperial
+
+    env.hass.config.units = METRIC_SYSTEM
+    assert entity.forecast == forecast